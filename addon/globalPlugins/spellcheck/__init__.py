@@ -32,12 +32,14 @@ from .language_dictionary import (
     set_enchant_language_dictionaries_directory,
     get_all_possible_languages,
     get_enchant_language_dictionary,
+    prewarm_language_dictionaries,
     download_language_dictionary,
+    refresh_directory_listings,
     LanguageDictionaryNotAvailable,
     LanguageDictionaryDownloadable,
     MultipleDownloadableLanguagesFound,
 )
-from .spellcheck_ui import SpellCheckMenu, SCRCAT__SPELLCHECK
+from .spellcheck_ui import SpellCheckMenu, SpellCheckJob, SCRCAT__SPELLCHECK
 
 
 import addonHandler
@@ -134,6 +136,36 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
         super().__init__(*args, **kwargs)
         set_enchant_language_dictionaries_directory()
         self._active_spellcheck_language = None
+        self._last_input_language = None
+        self._spellcheck_job = None
+        self._opened_misspellings_menu = None
+        with suppress(Exception):
+            self.prewarm_language_dictionaries(api.getFocusObject().windowThreadID)
+
+    def prewarm_language_dictionaries(self, thread_id):
+        """
+        Load the dictionary for the current input language, and the one chosen by the user if any,
+        off the main thread, so that the first spellcheck does not pay the loading cost.
+        """
+        input_language = self.get_input_language(thread_id)
+        if input_language == self._last_input_language:
+            return
+        self._last_input_language = input_language
+        prewarm_language_dictionaries(
+            (input_language, self._active_spellcheck_language)
+        )
+
+    def event_gainFocus(self, obj, nextHandler):
+        with suppress(Exception):
+            self.prewarm_language_dictionaries(obj.windowThreadID)
+        nextHandler()
+
+    def event_typedCharacter(self, obj, nextHandler, ch):
+        # NVDA has no dedicated event for keyboard layout switches
+        # so we check the layout whenever the user types something
+        with suppress(Exception):
+            self.prewarm_language_dictionaries(obj.windowThreadID)
+        nextHandler()
 
     def on_language_variance_download(self, lang_tag):
         wx.CallAfter(LanguageDictionaryDownloader(lang_tag, ask_user=False).download)
@@ -201,10 +233,43 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 _("Using the active Input language for spellchecking"),
             )
 
+    @script(
+        # translators: appears in the NVDA input help.
+        description=_(
+            "Refreshes the download information of every dictionary available for download"
+        ),
+        category=SCRCAT__SPELLCHECK,
+    )
+    def script_refresh_dictionary_download_information(self, gesture):
+        queueHandler.queueFunction(
+            queueHandler.eventQueue,
+            ui.message,
+            # Translators: spoken message when refreshing the dictionary download information starts
+            _("Refreshing dictionary download information…"),
+        )
+        refresh_directory_listings(self.on_directory_listings_refreshed)
+
+    def on_directory_listings_refreshed(self, exception):
+        if exception is None:
+            # Translators: spoken message when the dictionary download information has been refreshed
+            message = _("Dictionary download information refreshed")
+        else:
+            log.exception(
+                f"Failed to refresh the dictionary download information.\nException: {exception}"
+            )
+            # Translators: spoken message when refreshing the dictionary download information failed
+            message = _(
+                "Cannot refresh the dictionary download information. Please check your connection and try again."
+            )
+        queueHandler.queueFunction(queueHandler.eventQueue, ui.message, message)
+
     def spellcheck(self, language_tag, text_to_spellcheck):
         language_dictionary = self.obtain_language_dictionary(language_tag)
         if not language_dictionary:
             return
+        # A newer request supersedes any running one
+        if self._spellcheck_job is not None:
+            self._spellcheck_job.cancel()
         # Create our fake menu object
         misspellingsMenu = SpellCheckMenu(
             # translators: the name of the menu that shows up when the addon is being activated.
@@ -212,10 +277,24 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             language_dictionary=language_dictionary,
             text_to_process=text_to_spellcheck,
         )
-        if not misspellingsMenu.items:
-            # translators: announced when there are no spelling errors in a selected text.
-            ui.message("No spelling mistakes")
+        queueHandler.queueFunction(
+            queueHandler.eventQueue,
+            ui.message,
+            # translators: announced when spellchecking of the selected text starts.
+            _("Checking…"),
+        )
+        self._spellcheck_job = SpellCheckJob(
+            misspellingsMenu,
+            on_first_misspelling=self.open_misspellings_menu,
+            on_finished=self.on_spellcheck_finished,
+        )
+        self._spellcheck_job.start()
+
+    def open_misspellings_menu(self, misspellingsMenu):
+        # The user moved away while we were checking, `on_spellcheck_finished` tells them the count
+        if api.getFocusObject() is not misspellingsMenu.parent:
             return
+        self._opened_misspellings_menu = misspellingsMenu
         eventHandler.queueEvent("gainFocus", misspellingsMenu)
         queueHandler.queueFunction(
             queueHandler.eventQueue,
@@ -223,6 +302,26 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             "menu_open"
         )
 
+    def on_spellcheck_finished(self, misspellingsMenu, exception):
+        self._spellcheck_job = None
+        was_opened = misspellingsMenu is self._opened_misspellings_menu
+        self._opened_misspellings_menu = None
+        if exception is not None:
+            # Spoken wherever the focus is, or "Checking…" would be the last word on it
+            # translators: announced when spellchecking of the selected text fails.
+            ui.message(_("Cannot spellcheck the selected text"))
+            return
+        if not misspellingsMenu.items:
+            if api.getFocusObject() is misspellingsMenu.parent:
+                # translators: announced when there are no spelling errors in a selected text.
+                ui.message(_("No spelling mistakes"))
+        elif not was_opened:
+            # The menu never opened, so at least say what was found
+            ui.message(
+                # translators: announced when spellchecking finishes after the user moved away from the checked text.
+                _("Spelling mistakes found: {count}").format(count=len(misspellingsMenu))
+            )
+
     def obtain_language_dictionary(self, language_tag):
         try:
             return get_enchant_language_dictionary(language_tag)
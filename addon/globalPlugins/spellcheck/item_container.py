@@ -0,0 +1,106 @@
+# coding: utf-8
+
+# Copyright (c) 2021 Blind Pandas Team
+# This file is covered by the GNU General Public License.
+
+from contextlib import suppress
+
+
+class ItemContainerMixin:
+    # Set to False while items are still being added in the background
+    is_complete = True
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def index_of(self, item):
+        return self._positions.get(id(item))
+
+    def init_container_state(self, items, on_top_edge=None, on_bottom_edge=None):
+        self.items = items
+        self.children = items
+        self.controllerFor = self.children
+        self.on_top_edge = on_top_edge
+        self.on_bottom_edge = on_bottom_edge
+        self._current_index = 0
+        self._update_positions()
+
+    def _update_positions(self, start=0):
+        # Maps item identity to its index in the container
+        # Only the entries from `start` onwards are (re)computed
+        if start == 0:
+            self._positions = {}
+        positions = self._positions
+        items = self.items
+        for index in range(start, len(items)):
+            positions[id(items[index])] = index
+
+    def add_items(self, items):
+        start = len(self.items)
+        self.items.extend(items)
+        self._update_positions(start)
+
+    def set_current(self, index):
+        if index not in range(len(self)):
+            raise ValueError("Index out of range")
+        self._current_index = index
+
+    def get_item(self, index):
+        with suppress(IndexError):
+            return self.items[index]
+
+    def get_current_item(self):
+        return self.get_item(self._current_index)
+
+    def remove_item(self, item):
+        index = self._positions.pop(id(item), None)
+        if index is None:
+            return
+        del self.items[index]
+        # Only the items after the removed one have moved
+        self._update_positions(index)
+
+    def remove_items(self, items):
+        """Remove several items in a single pass over the container."""
+        ids_to_remove = {id(item) for item in items}
+        if not ids_to_remove:
+            return
+        first_index = min(
+            self._positions.get(item_id, len(self.items)) for item_id in ids_to_remove
+        )
+        # Modify in place, since `children` refers to the same list
+        self.items[first_index:] = [
+            item for item in self.items[first_index:] if id(item) not in ids_to_remove
+        ]
+        for item_id in ids_to_remove:
+            self._positions.pop(item_id, None)
+        self._update_positions(first_index)
+
+    def go_to_next(self):
+        item = self.get_item(self._current_index + 1)
+        if item is not None:
+            self._current_index += 1
+        elif self.items:
+            if self.on_bottom_edge is not None:
+                self.on_bottom_edge()
+                return
+            else:
+                item = self.items[-1]
+        return item
+
+    def go_to_prev(self):
+        prev_index = self._current_index - 1
+        if prev_index >= 0:
+            item = self.get_item(prev_index)
+            if item is not None:
+                self._current_index = prev_index
+        else:
+            if self.on_top_edge is not None:
+                self.on_top_edge()
+                return
+            elif len(self.items) > 0:
+                item = self.items[0]
+        return item
@@ -5,18 +5,36 @@
 
 import math
 import os
+import json
+import hashlib
+import threading
+import posixpath
+import tempfile
+import zipfile
 import globalVars
 import languageHandler
-from io import BytesIO
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager, suppress
 from functools import partial
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 from logHandler import log
 from .helpers import import_bundled_library, DATA_DIRECTORY
 
 
 with import_bundled_library():
     import enchant
+    import enchant.tokenize.en
     import httpx
-    from concurrent.futures import ThreadPoolExecutor
+    from enchant.compiled import CompiledDict, compile_hunspell_dictionary
+    from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+    try:
+        import h2
+    except ImportError:
+        HTTP2_AVAILABLE = False
+    else:
+        HTTP2_AVAILABLE = True
 
 
 # Constants
@@ -26,9 +44,55 @@ DICTIONARY_FILE_EXTS = {
     ".aff",
 }
 THREAD_POOL_EXECUTOR = ThreadPoolExecutor()
+# Suffix of files that are still being downloaded, enchant ignores these
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+# How many times a dropped download is resumed before giving up
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Give up quickly on sources we can't connect to, so the next source gets a chance
+DOWNLOAD_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+# The files of a dictionary are fetched concurrently using this executor
+DOWNLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+# Refreshing every directory listing has its own small executor,
+# so it doesn't hold up dictionary downloads or burst through GitHub's rate limit
+DIRECTORY_LISTINGS_EXECUTOR = ThreadPoolExecutor(max_workers=2)
 SPELLCHECK_DICTIONARIES_DIRECTORY = os.path.join(
     globalVars.appArgs.configPath, "spellcheck_dictionaries"
 )
+HUNSPELL_DICTIONARIES_DIRECTORY = os.path.join(
+    SPELLCHECK_DICTIONARIES_DIRECTORY, "hunspell"
+)
+# Precompiled, memory-mapped dictionaries used by the optional pure-Python engine
+COMPILED_DICTIONARIES_DIRECTORY = os.path.join(
+    SPELLCHECK_DICTIONARIES_DIRECTORY, "compiled"
+)
+COMPILED_DICTIONARY_EXT = ".scdx"
+# Languages answered from compiled dictionaries instead of Hunspell, one tag per line
+# Opt-in for each language, since the compiler doesn't expand compound words
+COMPILED_LANGUAGES_FILE = os.path.join(
+    SPELLCHECK_DICTIONARIES_DIRECTORY, "compiled_languages.txt"
+)
+# Give up on dictionaries whose affix rules expand to more words than this
+COMPILED_DICTIONARY_MAX_FORMS = 16 * 1024 * 1024
+# Languages whose dictionaries are being compiled in the background
+_COMPILING_LANGUAGES = set()
+_COMPILING_LANGUAGES_LOCK = threading.Lock()
+# Compiles of the same language hold its lock, so they run one after the other
+_COMPILE_LOCKS = {}
+# Where to get dictionaries from, one location per line in priority order
+DICTIONARY_SOURCES_FILE = os.path.join(
+    SPELLCHECK_DICTIONARIES_DIRECTORY, "dictionary_sources.txt"
+)
+# GitHub directory listings are cached here along with their ETag
+DIRECTORY_LISTINGS_DIRECTORY = os.path.join(
+    SPELLCHECK_DICTIONARIES_DIRECTORY, "listings"
+)
+# Upper bounds for the number of live dictionary handles we keep around
+# The byte budget is measured against the on-disk size of the .dic/.aff files
+DICTIONARY_CACHE_MAX_ENTRIES = 8
+DICTIONARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Number of misspelled words whose suggestions are remembered
+SUGGESTIONS_CACHE_MAX_ENTRIES = 4096
 with open(os.path.join(DATA_DIRECTORY, "downloadable_languages.txt"), "r") as file:
     DOWNLOADABLE_LANGUAGES = [tag.strip() for tag in file if tag.strip()]
 
@@ -52,6 +116,288 @@ class MultipleDownloadableLanguagesFound(LanguageDictionaryDownloadable):
         self.available_variances = available_variances
 
 
+class LanguageDictionaryCorrupted(IOError):
+    """Raised if a downloaded dictionary file does not match its expected size or checksum."""
+
+    def __init__(self, filename):
+        super().__init__(f"Downloaded file {filename} is corrupted")
+        self.filename = filename
+
+
+# The name is the file name, the size is in bytes, and the sha is the git blob SHA-1 (if known)
+DictionaryFileInfo = namedtuple("DictionaryFileInfo", "name download_url size sha")
+
+
+class LanguageDictionaryCache:
+    """
+    A process-wide LRU cache of live `enchant.Dict` objects keyed by language tag.
+    Entries are weighed by the size of their dictionary files, and the least
+    recently used ones are evicted once either the entry limit or the byte
+    budget is exceeded.
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        # Bumped for a base language on every invalidation
+        self._generations = {}
+        self._lock = threading.RLock()
+        # Loads go through enchant's shared broker, which is not thread safe,
+        # so only one dictionary is loaded at a time, whatever its language
+        self._load_lock = threading.Lock()
+
+    def __contains__(self, lang_tag):
+        with self._lock:
+            return lang_tag in self._entries
+
+    def get(self, lang_tag):
+        with self._lock:
+            try:
+                language_dictionary = self._entries[lang_tag][0]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(lang_tag)
+                self.hits += 1
+                return language_dictionary
+        # Load outside the main lock, Hunspell parsing could take a while
+        # Concurrent requests for the same language also wait for a single load
+        base_lang = lang_tag.split("_")[0]
+        with self._load_lock:
+            with self._lock:
+                if lang_tag in self._entries:
+                    return self._entries[lang_tag][0]
+                generation = self._generations.get(base_lang, 0)
+            language_dictionary = request_language_dictionary(lang_tag)
+            size = get_language_dictionary_files_size(language_dictionary.tag)
+            with self._lock:
+                # A dictionary loaded while its files were being replaced is
+                # returned this once, but not kept
+                if generation == self._generations.get(base_lang, 0):
+                    self._entries[lang_tag] = (language_dictionary, size)
+                    self._total_bytes += size
+                    self._evict()
+        log.debug(f"Loaded the dictionary for {lang_tag}, cache stats: {self.stats}")
+        return language_dictionary
+
+    def invalidate(self, lang_tag):
+        """Drop every entry that belongs to the same base language as `lang_tag`."""
+        base_lang = lang_tag.split("_")[0]
+        with self._lock:
+            self._generations[base_lang] = self._generations.get(base_lang, 0) + 1
+            for key in [k for k in self._entries if k.split("_")[0] == base_lang]:
+                self._remove(key)
+        log.debug(f"Invalidated the dictionaries for {base_lang}, cache stats: {self.stats}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _remove(self, lang_tag):
+        self._total_bytes -= self._entries.pop(lang_tag)[1]
+
+    def _evict(self):
+        # Always keep the most recently used entry, even if it is over budget on its own
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+
+LANGUAGE_DICTIONARY_CACHE = LanguageDictionaryCache(
+    DICTIONARY_CACHE_MAX_ENTRIES, DICTIONARY_CACHE_MAX_BYTES
+)
+
+
+class SuggestionsCache:
+    """
+    A process-wide LRU cache of the suggestions offered for misspelled words,
+    keyed by language tag and word.
+    It outlives individual spellcheck sessions, so each misspelling goes through
+    Hunspell's (slow) suggest only once.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Bumped for a base language on every invalidation
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, lang_tag, word):
+        with self._lock:
+            key = (lang_tag, word)
+            suggestions = self._entries.get(key)
+            if suggestions is not None:
+                self._entries.move_to_end(key)
+            return suggestions
+
+    def generation(self, lang_tag):
+        """Return a token that `put` uses to tell whether `lang_tag` was invalidated since."""
+        with self._lock:
+            return self._generations.get(lang_tag.split("_")[0], 0)
+
+    def put(self, lang_tag, word, suggestions, generation=None):
+        """
+        Cache the suggestions for `word`.
+        If `generation` is given, suggestions computed before the language was
+        invalidated are dropped instead.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generations.get(
+                lang_tag.split("_")[0], 0
+            ):
+                return
+            key = (lang_tag, word)
+            self._entries[key] = suggestions
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, lang_tag):
+        """Drop the suggestions of every language sharing the same base language as `lang_tag`."""
+        base_lang = lang_tag.split("_")[0]
+        with self._lock:
+            self._generations[base_lang] = self._generations.get(base_lang, 0) + 1
+            for key in [k for k in self._entries if k[0].split("_")[0] == base_lang]:
+                del self._entries[key]
+
+
+SUGGESTIONS_CACHE = SuggestionsCache(SUGGESTIONS_CACHE_MAX_ENTRIES)
+
+
+def get_language_dictionary_files_size(lang_tag):
+    total_size = 0
+    for ext in DICTIONARY_FILE_EXTS:
+        filename = os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, f"{lang_tag}{ext}")
+        try:
+            total_size += os.path.getsize(filename)
+        except OSError:
+            continue
+    return total_size
+
+
+def get_compiled_dictionary_path(lang_tag):
+    return os.path.join(
+        COMPILED_DICTIONARIES_DIRECTORY, f"{lang_tag}{COMPILED_DICTIONARY_EXT}"
+    )
+
+
+def get_compiled_languages():
+    """
+    Return the tags of the languages that use compiled dictionaries.
+    They are read from a text file with one language tag per line,
+    and no language uses them when the file does not exist.
+    """
+    try:
+        with open(COMPILED_LANGUAGES_FILE, "r", encoding="utf-8") as file:
+            return {
+                line.strip()
+                for line in file
+                if line.strip() and not line.lstrip().startswith("#")
+            }
+    except OSError:
+        return set()
+
+
+def compile_language_dictionary(lang_tag, only_if_needed=False):
+    """
+    Compile the installed Hunspell dictionary of the given language into a memory-mappable one.
+    Every compile goes through here, and compiles of the same language never overlap.
+    With only_if_needed, nothing is done if an earlier compile already wrote the dictionary.
+    Returns whether the dictionary was compiled.
+    """
+    with _COMPILING_LANGUAGES_LOCK:
+        compile_lock = _COMPILE_LOCKS.setdefault(lang_tag, threading.Lock())
+    with compile_lock:
+        if only_if_needed and not needs_compiling(lang_tag):
+            return False
+        os.makedirs(COMPILED_DICTIONARIES_DIRECTORY, exist_ok=True)
+        compile_hunspell_dictionary(
+            os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, f"{lang_tag}.dic"),
+            os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, f"{lang_tag}.aff"),
+            get_compiled_dictionary_path(lang_tag),
+            max_forms=COMPILED_DICTIONARY_MAX_FORMS,
+        )
+    # The next lookup switches from the Hunspell backed dictionary to the compiled one,
+    # whose suggestions differ
+    LANGUAGE_DICTIONARY_CACHE.invalidate(lang_tag)
+    SUGGESTIONS_CACHE.invalidate(lang_tag)
+    return True
+
+
+def needs_compiling(lang_tag):
+    return (
+        lang_tag in get_compiled_languages()
+        and not os.path.isfile(get_compiled_dictionary_path(lang_tag))
+        and os.path.isfile(os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, f"{lang_tag}.dic"))
+    )
+
+
+def compile_language_dictionary_in_background(lang_tag):
+    """Compile the dictionary of the given language without blocking the caller."""
+    with _COMPILING_LANGUAGES_LOCK:
+        if lang_tag in _COMPILING_LANGUAGES:
+            return
+        _COMPILING_LANGUAGES.add(lang_tag)
+    THREAD_POOL_EXECUTOR.submit(_do_compile_language_dictionary, lang_tag)
+
+
+def _do_compile_language_dictionary(lang_tag):
+    try:
+        compile_language_dictionary(lang_tag, only_if_needed=True)
+    except Exception:
+        log.exception(f"Failed to compile the dictionary for language {lang_tag}")
+    finally:
+        with _COMPILING_LANGUAGES_LOCK:
+            _COMPILING_LANGUAGES.discard(lang_tag)
+
+
+def request_language_dictionary(lang_tag):
+    """
+    Create a dictionary object for the given language.
+    Uses the compiled engine when it is enabled for the language and it has been compiled,
+    otherwise asks enchant for a Hunspell backed dictionary.
+    A language that has not been compiled yet is compiled in the background,
+    and enchant answers the queries in the meantime.
+    """
+    if lang_tag in get_compiled_languages():
+        compiled_path = get_compiled_dictionary_path(lang_tag)
+        if os.path.isfile(compiled_path):
+            # Share enchant's personal word lists, so added words survive either engine
+            return CompiledDict(
+                compiled_path,
+                tag=lang_tag,
+                pwl=os.path.join(SPELLCHECK_DICTIONARIES_DIRECTORY, f"{lang_tag}.dic"),
+                pel=os.path.join(SPELLCHECK_DICTIONARIES_DIRECTORY, f"{lang_tag}.exc"),
+            )
+        if needs_compiling(lang_tag):
+            compile_language_dictionary_in_background(lang_tag)
+    return enchant.request_dict(lang_tag)
+
+
 def set_enchant_language_dictionaries_directory():
     if not os.path.isdir(SPELLCHECK_DICTIONARIES_DIRECTORY):
         os.mkdir(SPELLCHECK_DICTIONARIES_DIRECTORY)
@@ -64,7 +410,7 @@ def get_all_possible_languages():
 
 def get_enchant_language_dictionary(lang_tag):
     try:
-        return enchant.request_dict(lang_tag)
+        return LANGUAGE_DICTIONARY_CACHE.get(lang_tag)
     except enchant.errors.DictNotFoundError:
         if lang_tag in DOWNLOADABLE_LANGUAGES:
             raise LanguageDictionaryDownloadable(lang_tag)
@@ -84,6 +430,40 @@ def get_enchant_language_dictionary(lang_tag):
     raise LanguageDictionaryNotAvailable(lang_tag)
 
 
+def prewarm_language_dictionaries(lang_tags):
+    """Load the dictionaries for the given languages in the background, one after the other."""
+    lang_tags = [
+        lang_tag
+        for lang_tag in dict.fromkeys(lang_tags)
+        if lang_tag and lang_tag not in LANGUAGE_DICTIONARY_CACHE
+    ]
+    if lang_tags:
+        THREAD_POOL_EXECUTOR.submit(_prewarm_language_dictionaries, lang_tags)
+
+
+def _prewarm_language_dictionaries(lang_tags):
+    # The tokenizer builds its unicode character classes on first use, do it here instead
+    enchant.tokenize.en.prewarm()
+    for lang_tag in lang_tags:
+        _prewarm_language_dictionary(lang_tag)
+
+
+def _prewarm_language_dictionary(lang_tag):
+    # Already off the main thread, so compile first rather than loading Hunspell twice
+    if needs_compiling(lang_tag):
+        try:
+            compile_language_dictionary(lang_tag, only_if_needed=True)
+        except Exception:
+            log.exception(f"Failed to compile the dictionary for language {lang_tag}")
+    try:
+        get_enchant_language_dictionary(lang_tag)
+    except LanguageDictionaryNotAvailable:
+        # Nothing to warm up, the user will be prompted when they actually spellcheck
+        pass
+    except Exception:
+        log.exception(f"Failed to pre-load the dictionary for language {lang_tag}")
+
+
 def download_language_dictionary(lang_tag, progress_callback, done_callback):
     if lang_tag not in DOWNLOADABLE_LANGUAGES:
         raise ValueError(f"Language {lang_tag} is not available for download")
@@ -92,41 +472,452 @@ def download_language_dictionary(lang_tag, progress_callback, done_callback):
     ).add_done_callback(partial(_done_callback, done_callback))
 
 
-def get_language_dictionary_download_info(lang_tag):
-    directory_listing = httpx.get(DICT_GITHUB_API_URL.format(lang_tag=lang_tag)).json()
+def get_language_dictionary_download_info(lang_tag, client=httpx):
+    return GitHubDictionarySource().get_download_info(lang_tag, client)
+
+
+def _make_download_info(directory_listing):
     return {
-        entry["name"]: (entry["download_url"], entry["size"])
+        entry["name"]: DictionaryFileInfo(
+            entry["name"], entry["download_url"], entry["size"], entry.get("sha")
+        )
         for entry in directory_listing
         if os.path.splitext(entry["name"])[-1] in DICTIONARY_FILE_EXTS
     }
 
 
-def _do_download__and_extract_lang_dictionary(lang_tag, progress_callback):
-    download_info = get_language_dictionary_download_info(lang_tag)
-    name_to_buffer = {}
-    total_size = sum(filesize for (n, (u, filesize)) in download_info.items())
-    downloaded_til_now = 0
-    for (filename, (download_url, file_size)) in download_info.items():
-        with httpx.Client() as client:
-            with client.stream("GET", download_url) as response:
-                file_buffer = BytesIO()
-                for data in response.iter_bytes():
-                    file_buffer.write(data)
-                    downloaded_til_now += len(data)
-                    progress = math.floor((downloaded_til_now / total_size) * 100)
-                    progress_callback(progress)
-                file_buffer.seek(0)
-                name_to_buffer[filename] = file_buffer
-    # Now copy the downloaded file to the destination
-    hunspell_extraction_directory = os.path.join(
-        SPELLCHECK_DICTIONARIES_DIRECTORY, "hunspell"
+class DictionarySource:
+    """
+    A place language dictionaries can be fetched from.
+    Every source lays dictionaries out like the LibreOffice dictionaries repository,
+    i.e. the files of a language live in a folder named after its tag.
+    """
+
+    def get_download_info(self, lang_tag, client):
+        """Return a dict mapping file names to `DictionaryFileInfo` for the given language."""
+        raise NotImplementedError
+
+    @contextmanager
+    def open_stream(self, client, file_info, offset):
+        """
+        Open the given file for reading starting at `offset`.
+        Yields the offset the data actually starts at, which is 0 if the source can not resume,
+        along with an iterator over chunks of the file contents.
+        """
+        raise NotImplementedError
+
+
+class HttpMirrorDictionarySource(DictionarySource):
+    """
+    A plain HTTP server mirroring the dictionaries.
+    Each language folder contains a `listing.json` in the same format as the GitHub contents API.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.base_url!r})"
+
+    def get_download_info(self, lang_tag, client):
+        listing_url = f"{self.base_url}/{lang_tag}/listing.json"
+        response = client.get(listing_url)
+        response.raise_for_status()
+        directory_listing = [
+            # Mirrors may omit the download URL of the files next to the listing
+            {**entry, "download_url": entry.get("download_url") or f"{self.base_url}/{lang_tag}/{entry['name']}"}
+            for entry in response.json()
+        ]
+        return _make_download_info(directory_listing)
+
+    @contextmanager
+    def open_stream(self, client, file_info, offset):
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with client.stream("GET", file_info.download_url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != httpx.codes.PARTIAL_CONTENT:
+                # The server ignored the range and sent the whole file
+                offset = 0
+            yield offset, response.iter_bytes()
+
+
+class GitHubDictionarySource(HttpMirrorDictionarySource):
+    """The LibreOffice dictionaries repository on GitHub."""
+
+    def __init__(self):
+        super().__init__("https://raw.githubusercontent.com/LibreOffice/dictionaries/master")
+
+    def get_download_info(self, lang_tag, client):
+        return _make_download_info(get_directory_listing(lang_tag, client))
+
+
+class LocalDirectoryDictionarySource(DictionarySource):
+    """A local or network folder, given as a path or a file:// URL."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.directory!r})"
+
+    def get_download_info(self, lang_tag, client):
+        lang_directory = os.path.join(self.directory, lang_tag)
+        if not os.path.isdir(lang_directory):
+            raise LanguageDictionaryNotAvailable(lang_tag)
+        return {
+            entry.name: DictionaryFileInfo(entry.name, entry.path, entry.stat().st_size, None)
+            for entry in os.scandir(lang_directory)
+            if entry.is_file() and os.path.splitext(entry.name)[-1] in DICTIONARY_FILE_EXTS
+        }
+
+    @contextmanager
+    def open_stream(self, client, file_info, offset):
+        with open(file_info.download_url, "rb") as file:
+            file.seek(offset)
+            yield offset, iter(partial(file.read, DOWNLOAD_CHUNK_SIZE), b"")
+
+
+class ZipBundleDictionarySource(DictionarySource):
+    """A zip archive of language folders, given as a path or a file:// URL."""
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.archive_path!r})"
+
+    def get_download_info(self, lang_tag, client):
+        with zipfile.ZipFile(self.archive_path, "r") as archive:
+            download_info = {
+                posixpath.basename(member.filename): DictionaryFileInfo(
+                    posixpath.basename(member.filename), member.filename, member.file_size, None
+                )
+                for member in archive.infolist()
+                if posixpath.dirname(member.filename) == lang_tag
+                and posixpath.splitext(member.filename)[-1] in DICTIONARY_FILE_EXTS
+            }
+        if not download_info:
+            raise LanguageDictionaryNotAvailable(lang_tag)
+        return download_info
+
+    @contextmanager
+    def open_stream(self, client, file_info, offset):
+        # Compressed members can't be seeked cheaply, so always start over
+        with zipfile.ZipFile(self.archive_path, "r") as archive:
+            with archive.open(file_info.download_url, "r") as file:
+                yield 0, iter(partial(file.read, DOWNLOAD_CHUNK_SIZE), b"")
+
+
+def file_url_to_path(url):
+    """Convert a file:// address to a path, including network shares such as file://server/share."""
+    parsed_url = urlparse(url)
+    path = url2pathname(parsed_url.path)
+    if parsed_url.netloc and parsed_url.netloc.lower() != "localhost":
+        # The host is part of a UNC path: \\server\share\...
+        path = "\\\\" + parsed_url.netloc + path
+    return path
+
+
+def make_dictionary_source(location):
+    """Create a dictionary source from a line of the dictionary sources file."""
+    if location.lower() == "github":
+        return GitHubDictionarySource()
+    if location.lower().startswith(("http://", "https://")):
+        return HttpMirrorDictionarySource(location)
+    if location.lower().startswith("file:"):
+        location = file_url_to_path(location)
+    if location.lower().endswith(".zip"):
+        return ZipBundleDictionarySource(location)
+    return LocalDirectoryDictionarySource(location)
+
+
+def get_dictionary_sources():
+    """
+    Return the configured dictionary sources in priority order.
+    Sources are read from a text file with one location per line,
+    and default to GitHub when the file does not exist.
+    """
+    try:
+        with open(DICTIONARY_SOURCES_FILE, "r", encoding="utf-8") as file:
+            locations = [
+                line.strip()
+                for line in file
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+    except OSError:
+        locations = []
+    sources = []
+    for location in locations:
+        try:
+            sources.append(make_dictionary_source(location))
+        except Exception:
+            log.exception(f"Invalid dictionary source: {location}")
+    return sources or [GitHubDictionarySource()]
+
+
+def get_directory_listing(lang_tag, client=httpx):
+    """
+    Get the GitHub directory listing for the given language.
+    The listing is cached on disk, and revalidated using its ETag,
+    so unchanged listings are served from disk and don't count against the API rate limit.
+    """
+    cached = _load_cached_directory_listing(lang_tag)
+    headers = {}
+    if cached is not None:
+        headers["If-None-Match"] = cached["etag"]
+    response = client.get(DICT_GITHUB_API_URL.format(lang_tag=lang_tag), headers=headers)
+    if cached is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+        return cached["listing"]
+    response.raise_for_status()
+    directory_listing = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        _save_cached_directory_listing(lang_tag, etag, directory_listing)
+    return directory_listing
+
+
+def refresh_directory_listings(done_callback=None):
+    """Revalidate the cached directory listings of every downloadable language in the background."""
+    THREAD_POOL_EXECUTOR.submit(_do_refresh_directory_listings).add_done_callback(
+        partial(_done_callback, done_callback)
+    )
+
+
+def _do_refresh_directory_listings():
+    with httpx.Client(http2=HTTP2_AVAILABLE) as client:
+        futures = [
+            DIRECTORY_LISTINGS_EXECUTOR.submit(get_directory_listing, lang_tag, client)
+            for lang_tag in DOWNLOADABLE_LANGUAGES
+        ]
+        for future in as_completed(futures):
+            if _is_rate_limit_error(future.exception()):
+                # Every other request would fail the same way until the limit resets
+                for pending in futures:
+                    pending.cancel()
+                break
+        wait(futures)
+    failed = [f for f in futures if not f.cancelled() and f.exception() is not None]
+    if failed:
+        raise failed[0].exception()
+
+
+def _is_rate_limit_error(error):
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code in (httpx.codes.FORBIDDEN, httpx.codes.TOO_MANY_REQUESTS)
+        and error.response.headers.get("X-RateLimit-Remaining") == "0"
     )
-    if not os.path.isdir(hunspell_extraction_directory):
-        os.mkdir(hunspell_extraction_directory)
-    for (filename, file_buffer) in name_to_buffer.items():
-        full_file_path = os.path.join(hunspell_extraction_directory, filename)
-        with open(full_file_path, "wb") as output_file:
-            output_file.write(file_buffer.getvalue())
+
+
+def _get_directory_listing_cache_path(lang_tag):
+    return os.path.join(DIRECTORY_LISTINGS_DIRECTORY, f"{lang_tag}.json")
+
+
+def _load_cached_directory_listing(lang_tag):
+    try:
+        with open(_get_directory_listing_cache_path(lang_tag), "r", encoding="utf-8") as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return
+    if isinstance(cached, dict) and {"etag", "listing"}.issubset(cached):
+        return cached
+
+
+def _save_cached_directory_listing(lang_tag, etag, directory_listing):
+    os.makedirs(DIRECTORY_LISTINGS_DIRECTORY, exist_ok=True)
+    cache_path = _get_directory_listing_cache_path(lang_tag)
+    # Concurrent writers of the same listing each get their own temporary file
+    (fd, temp_file_path) = tempfile.mkstemp(
+        prefix=os.path.basename(cache_path) + ".",
+        suffix=PARTIAL_DOWNLOAD_SUFFIX,
+        dir=DIRECTORY_LISTINGS_DIRECTORY,
+    )
+    try:
+        with open(fd, "w", encoding="utf-8") as file:
+            json.dump({"etag": etag, "listing": directory_listing}, file)
+        os.replace(temp_file_path, cache_path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_file_path)
+        raise
+
+
+class DownloadProgress:
+    """Combines the progress of several concurrent downloads into a single percentage."""
+
+    def __init__(self, total_size, progress_callback):
+        self.total_size = total_size
+        self.progress_callback = progress_callback
+        self._downloaded = {}
+        self._last_reported = None
+        self._lock = threading.Lock()
+
+    def update(self, filename, downloaded_bytes):
+        """Set the number of bytes of the given file we have so far."""
+        with self._lock:
+            self._downloaded[filename] = downloaded_bytes
+            if not self.total_size:
+                return
+            downloaded = sum(self._downloaded.values())
+            progress = min(math.floor((downloaded / self.total_size) * 100), 100)
+            # Only report when the percentage actually changes
+            if progress == self._last_reported:
+                return
+            self._last_reported = progress
+            self.progress_callback(progress)
+
+
+def _download_file(source, client, file_info, destination, download_progress):
+    """
+    Download the file to a partial file next to its destination and return its path.
+    An existing partial file from an earlier attempt is resumed rather than started over.
+    The caller moves the file into place once every file of the dictionary is complete,
+    so enchant never sees a half-written dictionary.
+    """
+    temp_file_path = destination + PARTIAL_DOWNLOAD_SUFFIX
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        try:
+            _fetch_file(source, client, file_info, temp_file_path, download_progress)
+        except httpx.TransportError:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            log.debugWarning(
+                f"Connection dropped while downloading {file_info.name}, resuming"
+            )
+        else:
+            break
+    _verify_downloaded_file(temp_file_path, file_info)
+    return temp_file_path
+
+
+def _fetch_file(source, client, file_info, temp_file_path, download_progress):
+    try:
+        existing_size = os.path.getsize(temp_file_path)
+    except OSError:
+        existing_size = 0
+    if existing_size > file_info.size:
+        # Not a prefix of the file we want, start over
+        os.remove(temp_file_path)
+        existing_size = 0
+    download_progress.update(file_info.name, existing_size)
+    if existing_size == file_info.size:
+        return
+    with source.open_stream(client, file_info, existing_size) as (offset, chunks):
+        with open(temp_file_path, "ab" if offset else "wb") as output_file:
+            downloaded = offset
+            for data in chunks:
+                output_file.write(data)
+                downloaded += len(data)
+                download_progress.update(file_info.name, downloaded)
+
+
+def _verify_downloaded_file(file_path, file_info):
+    """Check the file against the size and git blob SHA-1 from the directory listing."""
+    is_valid = os.path.getsize(file_path) == file_info.size
+    if is_valid and file_info.sha:
+        hasher = hashlib.sha1(f"blob {file_info.size}\0".encode("ascii"))
+        with open(file_path, "rb") as file:
+            for chunk in iter(partial(file.read, DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        is_valid = hasher.hexdigest() == file_info.sha
+    if not is_valid:
+        # Resuming a corrupted file would not help
+        os.remove(file_path)
+        raise LanguageDictionaryCorrupted(file_info.name)
+
+
+def _do_download__and_extract_lang_dictionary(lang_tag, progress_callback):
+    if not os.path.isdir(HUNSPELL_DICTIONARIES_DIRECTORY):
+        os.mkdir(HUNSPELL_DICTIONARIES_DIRECTORY)
+    # A single pooled client, so connections are reused between requests
+    # The short connect timeout lets us move on quickly from unreachable sources
+    with httpx.Client(http2=HTTP2_AVAILABLE, timeout=DOWNLOAD_TIMEOUT) as client:
+        sources = get_dictionary_sources()
+        for (index, source) in enumerate(sources):
+            download_info = {}
+            try:
+                download_info = source.get_download_info(lang_tag, client)
+                if not download_info:
+                    raise LanguageDictionaryNotAvailable(lang_tag)
+                temp_files = _download_files(
+                    source, client, download_info, progress_callback
+                )
+            except Exception:
+                if index == len(sources) - 1:
+                    raise
+                log.debugWarning(
+                    f"Failed to get the dictionary for {lang_tag} from {source!r}, trying the next source",
+                    exc_info=True,
+                )
+                # Partial files from another source can't be resumed
+                _remove_partial_downloads(download_info)
+            else:
+                break
+    # Every file is complete, now move them into place
+    for (filename, temp_file_path) in temp_files.items():
+        os.replace(
+            temp_file_path, os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, filename)
+        )
+    # Compile before invalidating, so the next lookup doesn't load the stale compiled files
+    _update_compiled_dictionaries(temp_files)
+    # Make sure the next lookup loads the new files
+    LANGUAGE_DICTIONARY_CACHE.invalidate(lang_tag)
+    SUGGESTIONS_CACHE.invalidate(lang_tag)
+    # Pooled dictionaries are keyed by the requested tag, which can resolve to
+    # any of the files just installed (e.g. "en" to "en_US"), so drop them all
+    enchant.discard_pooled_dicts()
+
+
+def _update_compiled_dictionaries(filenames):
+    # Compiled dictionaries of the old files are stale now
+    compiled_languages = get_compiled_languages()
+    for filename in filenames:
+        (dict_tag, ext) = os.path.splitext(filename)
+        if ext != ".dic":
+            continue
+        if dict_tag in compiled_languages:
+            try:
+                compile_language_dictionary(dict_tag)
+            except Exception:
+                log.exception(f"Failed to compile the dictionary for language {dict_tag}")
+            else:
+                continue
+        with suppress(OSError):
+            os.remove(get_compiled_dictionary_path(dict_tag))
+
+
+def _download_files(source, client, download_info, progress_callback):
+    total_size = sum(file_info.size for file_info in download_info.values())
+    download_progress = DownloadProgress(total_size, progress_callback)
+    futures = {
+        filename: DOWNLOAD_EXECUTOR.submit(
+            _download_file,
+            source,
+            client,
+            file_info,
+            os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, filename),
+            download_progress,
+        )
+        for (filename, file_info) in download_info.items()
+    }
+    try:
+        return {filename: future.result() for (filename, future) in futures.items()}
+    except Exception:
+        # Don't start the remaining files, and wait for the running ones before closing the client
+        # Partial files are kept on disk, so that the next attempt can resume them
+        for future in futures.values():
+            future.cancel()
+        wait(futures.values())
+        raise
+
+
+def _remove_partial_downloads(download_info):
+    for filename in download_info:
+        with suppress(OSError):
+            os.remove(
+                os.path.join(HUNSPELL_DICTIONARIES_DIRECTORY, filename)
+                + PARTIAL_DOWNLOAD_SUFFIX
+            )
 
 
 def _done_callback(done_callback, future):
@@ -75,7 +75,11 @@ _DOC_ERRORS = ["enchnt", "enchnt", "incant", "fr"]
 __version__ = "3.2.1"
 
 import os
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from contextlib import contextmanager
 
 try:
     from enchant import _enchant as _e
@@ -88,6 +92,15 @@ from enchant.errors import Error, DictNotFoundError
 from enchant.utils import get_default_language
 from enchant.pypwl import PyPWL
 
+#  Default number of spellcheck verdicts remembered by each Dict object.
+VERDICT_CACHE_SIZE = 20000
+
+#  Default number of Dict objects a DictPool keeps for each language.
+DICT_POOL_SIZE = 4
+
+#  Default number of seconds after which a DictPool frees an unused Dict.
+DICT_POOL_IDLE_TIMEOUT = 300.0
+
 
 class ProviderDesc:
     """Simple class describing an Enchant provider.
@@ -183,6 +196,96 @@ class _EnchantObject:
         self._init_this()
 
 
+class VerdictCache:
+    """Bounded LRU cache of spellcheck verdicts.
+
+    The Broker keeps one of these for each dictionary it hands out, and
+    all the Dict objects using that dictionary share it.  Only the verdicts
+    of the dictionary itself are cached.  Natural text repeats a small set of words
+    over and over, so most checks can be answered without calling into
+    the C library at all.  Hit and miss counts are kept so the cache can
+    be sized; see the 'info' method.
+
+    Dict objects sharing a cache may be used from different threads, so
+    every method holds a lock.  The get_many and put_many methods take it
+    once for a whole batch of words.
+    """
+
+    def __init__(self, maxsize=VERDICT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._verdicts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._verdicts)
+
+    def get(self, word):
+        """Get the cached verdict for a word, or None if not cached."""
+        with self._lock:
+            verdict = self._verdicts.get(word)
+            if verdict is None:
+                self.misses += 1
+            else:
+                self._verdicts.move_to_end(word)
+                self.hits += 1
+            return verdict
+
+    def get_many(self, words):
+        """Get the cached verdicts for several words, None for those not cached."""
+        lookup = self._verdicts.get
+        move_to_end = self._verdicts.move_to_end
+        res = []
+        with self._lock:
+            for word in words:
+                verdict = lookup(word)
+                if verdict is not None:
+                    move_to_end(word)
+                res.append(verdict)
+            misses = res.count(None)
+            self.misses += misses
+            self.hits += len(res) - misses
+        return res
+
+    def put(self, word, verdict):
+        """Remember the verdict for a word, evicting the oldest if full."""
+        with self._lock:
+            self._put(word, verdict)
+
+    def put_many(self, words, verdicts):
+        """Remember the verdicts for several words, evicting the oldest if full."""
+        with self._lock:
+            for (word, verdict) in zip(words, verdicts):
+                self._put(word, verdict)
+
+    def _put(self, word, verdict):
+        if self.maxsize <= 0:
+            return
+        self._verdicts[word] = verdict
+        self._verdicts.move_to_end(word)
+        if len(self._verdicts) > self.maxsize:
+            self._verdicts.popitem(last=False)
+
+    def clear(self):
+        """Forget all cached verdicts."""
+        with self._lock:
+            self._verdicts.clear()
+
+    def info(self):
+        """Return a dict of statistics about the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "size": len(self._verdicts),
+                "maxsize": self.maxsize,
+            }
+
+
 class Broker(_EnchantObject):
     """Broker object for the Enchant spellchecker.
 
@@ -212,6 +315,8 @@ class Broker(_EnchantObject):
         if not self._this:
             raise Error("Could not initialise an enchant broker.")
         self._live_dicts = {}
+        # Verdicts of each live dict, shared by all the Dicts using it
+        self._verdict_caches = {}
 
     def __del__(self):
         """Broker object destructor."""
@@ -224,6 +329,7 @@ class Broker(_EnchantObject):
     def __getstate__(self):
         state = super().__getstate__()
         state.pop("_live_dicts")
+        state.pop("_verdict_caches")
         return state
 
     def _raise_error(self, default="Unspecified Error", eclass=Error):
@@ -287,6 +393,7 @@ class Broker(_EnchantObject):
             self._raise_error(e_str % (tag,), DictNotFoundError)
         if new_dict not in self._live_dicts:
             self._live_dicts[new_dict] = 1
+            self._verdict_caches[new_dict] = VerdictCache()
         else:
             self._live_dicts[new_dict] += 1
         return new_dict
@@ -306,6 +413,7 @@ class Broker(_EnchantObject):
             self._raise_error(e_str % (pwl,))
         if new_dict not in self._live_dicts:
             self._live_dicts[new_dict] = 1
+            self._verdict_caches[new_dict] = VerdictCache()
         else:
             self._live_dicts[new_dict] += 1
         d = Dict(False)
@@ -330,6 +438,7 @@ class Broker(_EnchantObject):
         self._live_dicts[dict] -= 1
         if self._live_dicts[dict] == 0:
             del self._live_dicts[dict]
+            del self._verdict_caches[dict]
 
     def dict_exists(self, tag):
         """Check availability of a dictionary.
@@ -526,6 +635,7 @@ class Dict(_EnchantObject):
         """
         # Initialise misc object attributes to None
         self.provider = None
+        self._verdicts = VerdictCache()
         # If no tag was given, use the default language
         if tag is None:
             tag = get_default_language()
@@ -575,6 +685,7 @@ class Dict(_EnchantObject):
         # Hook in the new stuff
         self._this = this
         self._broker = broker
+        self._verdicts = broker._verdict_caches[this]
         # Update object properties
         desc = self.__describe(check_this=False)
         self.tag = desc[0]
@@ -619,6 +730,16 @@ class Dict(_EnchantObject):
         This method takes a word in the dictionary language and returns
         True if it is correctly spelled, and false otherwise.
         """
+        # A freed Dict must fail even for words whose verdicts are cached
+        self._check_this()
+        verdict = self._verdicts.get(word)
+        if verdict is None:
+            verdict = self._check(word)
+            self._verdicts.put(word, verdict)
+        return verdict
+
+    def _check(self, word):
+        """Check spelling of a word, bypassing the verdict cache."""
         self._check_this()
         # Enchant asserts that the word is non-empty.
         # Check it up-front to avoid nasty warnings on stderr.
@@ -631,6 +752,62 @@ class Dict(_EnchantObject):
             return False
         self._raise_error()
 
+    def check_many(self, words):
+        """Check spelling of several words at once.
+
+        This method takes a sequence of words in the dictionary language
+        and returns a list holding the indices of the words that are not
+        correctly spelled, in increasing order.  The result is the same
+        as calling check() on each word, but the validity checks and the
+        ctypes argument setup are done once for the whole sequence.
+        """
+        self._check_this()
+        words = list(words)
+        misspelled = []
+        unknown_indices = []
+        unknown_words = []
+        for (idx, verdict) in enumerate(self._verdicts.get_many(words)):
+            if verdict is None:
+                unknown_indices.append(idx)
+                unknown_words.append(words[idx])
+            elif not verdict:
+                misspelled.append(idx)
+        if unknown_words:
+            newly_misspelled = set(self._check_many(unknown_words))
+            self._verdicts.put_many(
+                unknown_words,
+                [i not in newly_misspelled for i in range(len(unknown_words))],
+            )
+            misspelled.extend(unknown_indices[i] for i in newly_misspelled)
+            misspelled.sort()
+        return misspelled
+
+    def _check_many(self, words):
+        """Check spelling of several words, bypassing the verdict cache."""
+        self._check_this()
+        this = _e.t_dict(self._this)
+        dict_check = _e.dict_check1
+        misspelled = []
+        for (idx, word) in enumerate(words):
+            # Enchant asserts that the word is non-empty.
+            if len(word) == 0:
+                raise ValueError("can't check spelling of empty string")
+            word = word.encode()
+            val = dict_check(this, word, len(word))
+            if val > 0:
+                misspelled.append(idx)
+            elif val < 0:
+                self._raise_error()
+        return misspelled
+
+    def verdict_cache_info(self):
+        """Return statistics about the verdict cache of this dictionary.
+
+        The result is a dict with the number of 'hits' and 'misses', the
+        'hit_rate', and the current 'size' and 'maxsize' of the cache.
+        """
+        return self._verdicts.info()
+
     def suggest(self, word):
         """Suggest possible spellings for a word.
 
@@ -649,11 +826,13 @@ class Dict(_EnchantObject):
         """Add a word to the user's personal word list."""
         self._check_this()
         _e.dict_add(self._this, word.encode())
+        self._verdicts.clear()
 
     def remove(self, word):
         """Add a word to the user's personal exclude list."""
         self._check_this()
         _e.dict_remove(self._this, word.encode())
+        self._verdicts.clear()
 
     def add_to_pwl(self, word):
         """Add a word to the user's personal word list."""
@@ -664,16 +843,19 @@ class Dict(_EnchantObject):
         )
         self._check_this()
         _e.dict_add_to_pwl(self._this, word.encode())
+        self._verdicts.clear()
 
     def add_to_session(self, word):
         """Add a word to the session personal list."""
         self._check_this()
         _e.dict_add_to_session(self._this, word.encode())
+        self._verdicts.clear()
 
     def remove_from_session(self, word):
         """Add a word to the session exclude list."""
         self._check_this()
         _e.dict_remove_from_session(self._this, word.encode())
+        self._verdicts.clear()
 
     def is_added(self, word):
         """Check whether a word is in the personal word list."""
@@ -821,8 +1003,10 @@ class DictWithPWL(Dict):
 
         This method takes a word in the dictionary language and returns
         True if it is correctly spelled, and false otherwise.  It checks
-        both the dictionary and the personal word list.
+        the personal exclude list, the personal word list and finally the
+        dictionary itself.
         """
+        self._check_this()
         if self.pel.check(word):
             return False
         if self.pwl.check(word):
@@ -831,6 +1015,29 @@ class DictWithPWL(Dict):
             return True
         return False
 
+    def check_many(self, words):
+        """Check spelling of several words at once.
+
+        Only the words found in neither the personal word list nor the
+        personal exclude list are passed on to the dictionary.
+        """
+        self._check_this()
+        misspelled = []
+        unknown_indices = []
+        unknown_words = []
+        for (idx, word) in enumerate(words):
+            if self.pel.check(word):
+                misspelled.append(idx)
+            elif not self.pwl.check(word):
+                unknown_indices.append(idx)
+                unknown_words.append(word)
+        if unknown_words:
+            misspelled.extend(
+                unknown_indices[i] for i in super().check_many(unknown_words)
+            )
+            misspelled.sort()
+        return misspelled
+
     def suggest(self, word):
         """Suggest possible spellings for a word.
 
@@ -881,6 +1088,179 @@ class DictWithPWL(Dict):
         return self.pel.is_added(word)
 
 
+class DictPool:
+    """Pool of Dict objects handing out exclusive leases by language tag.
+
+    A Dict must not be used by several threads at once.  This class lends
+    each of its Dict objects to a single user at a time, creating up to
+    <max_size> of them for each language as needed.  Dicts that have not
+    been leased for <idle_timeout> seconds are freed the next time the
+    pool is used.
+
+    The Enchant library hands out the same dictionary data each time a
+    Broker is asked for a given language.  The pool therefore keeps a list
+    of Brokers shared by all languages, and requests each Dict of a
+    language from a different one of them.  Brokers are not thread safe,
+    so Dicts are created and freed under a lock for each Broker.
+
+        >>> pool = DictPool()
+        >>> with pool.lease("en_US") as d:
+        ...     d.check("hello")
+        ...
+        True
+        >>>
+
+    """
+
+    def __init__(self, max_size=DICT_POOL_SIZE, idle_timeout=DICT_POOL_IDLE_TIMEOUT):
+        """DictPool object constructor."""
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Condition()
+        # The Broker of each slot is shared by all languages, and Brokers
+        # are not thread safe.  Dicts are created and freed under its lock.
+        self._brokers = []
+        self._broker_locks = []
+        # Unused Dicts of each language as (dict, slot, last_used) tuples,
+        # the most recently used last.  The slot is the index of the Broker.
+        self._idle = {}
+        # Slots taken by the leased and unused Dicts of each language
+        self._slots = {}
+        # Maps each leased Dict to its (tag, slot, generation)
+        self._leased = {}
+        # Bumped by 'discard' so that leased Dicts are not reused
+        self._generations = {}
+
+    def acquire(self, tag, timeout=None):
+        """Lease a Dict for the language specified by <tag>.
+
+        This method returns a Dict that is not used by anyone else until
+        it is given back using 'release'.  If <max_size> Dicts are already
+        leased for the language, it waits for one of them to be released.
+        Error is raised if that takes more than <timeout> seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        expired = []
+        try:
+            with self._lock:
+                while True:
+                    expired.extend(self._evict_idle())
+                    idle = self._idle.get(tag)
+                    if idle:
+                        (dict, slot, _) = idle.pop()
+                        if not idle:
+                            del self._idle[tag]
+                        generation = self._generations.get(tag, 0)
+                        self._leased[dict] = (tag, slot, generation)
+                        return dict
+                    slots = self._slots.setdefault(tag, set())
+                    if len(slots) < self.max_size:
+                        slot = min(set(range(len(slots) + 1)) - slots)
+                        slots.add(slot)
+                        generation = self._generations.get(tag, 0)
+                        while len(self._brokers) <= slot:
+                            self._brokers.append(Broker())
+                            self._broker_locks.append(threading.Lock())
+                        broker = self._brokers[slot]
+                        break
+                    if deadline is None:
+                        self._lock.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            err = "Timed out waiting for a dictionary for language '%s'"
+                            raise Error(err % (tag,))
+                        self._lock.wait(remaining)
+        finally:
+            self._free_dicts(expired)
+        # Loading the dictionary can take a while, so don't hold the pool lock
+        try:
+            with self._broker_locks[slot]:
+                dict = Dict(tag, broker)
+        except BaseException:
+            with self._lock:
+                self._release_slot(tag, slot)
+            raise
+        with self._lock:
+            self._leased[dict] = (tag, slot, generation)
+        return dict
+
+    def release(self, dict):
+        """Give back a Dict leased using 'acquire'."""
+        with self._lock:
+            (tag, slot, generation) = self._leased.pop(dict)
+            if generation == self._generations.get(tag, 0):
+                self._idle.setdefault(tag, []).append((dict, slot, time.monotonic()))
+                self._lock.notify_all()
+                expired = []
+            else:
+                self._release_slot(tag, slot)
+                expired = [(dict, slot)]
+            expired.extend(self._evict_idle())
+        self._free_dicts(expired)
+
+    @contextmanager
+    def lease(self, tag, timeout=None):
+        """Lease a Dict for the duration of a 'with' statement.
+
+        This method is a context manager calling 'acquire' on entry and
+        'release' on exit, see 'acquire' for details.
+        """
+        dict = self.acquire(tag, timeout)
+        try:
+            yield dict
+        finally:
+            self.release(dict)
+
+    def discard(self, tag=None):
+        """Free the pooled Dicts of the language <tag>, or of all languages.
+
+        This should be called when dictionaries are installed or updated,
+        so that later leases load them afresh.  Dicts that are currently
+        leased are freed once they are released.
+        """
+        expired = []
+        with self._lock:
+            tags = list(self._slots) if tag is None else [tag]
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for (dict, slot, _) in self._idle.pop(tag, ()):
+                    self._release_slot(tag, slot)
+                    expired.append((dict, slot))
+        self._free_dicts(expired)
+
+    def _evict_idle(self):
+        """Take out the Dicts that have not been leased for too long.
+
+        This returns the (dict, slot) pairs to be passed to '_free_dicts'
+        once the pool lock has been released.
+        """
+        expired = []
+        expiry = time.monotonic() - self.idle_timeout
+        for (tag, idle) in list(self._idle.items()):
+            while idle and idle[0][2] < expiry:
+                (dict, slot, _) = idle.pop(0)
+                self._release_slot(tag, slot)
+                expired.append((dict, slot))
+            if not idle:
+                del self._idle[tag]
+        return expired
+
+    def _free_dicts(self, dicts):
+        """Free the given (dict, slot) pairs, each under its Broker's lock."""
+        for (dict, slot) in dicts:
+            with self._broker_locks[slot]:
+                dict._free()
+
+    def _release_slot(self, tag, slot):
+        """Make a slot of the given language available again."""
+        slots = self._slots[tag]
+        slots.discard(slot)
+        if not slots:
+            del self._slots[tag]
+        self._lock.notify_all()
+
+
 ##  Create a module-level default broker object, and make its important
 ##  methods available at the module level.
 _broker = Broker()
@@ -892,6 +1272,12 @@ list_languages = _broker.list_languages
 get_param = _broker.get_param
 set_param = _broker.set_param
 
+#  Create a module-level pool of Dict objects for concurrent use,
+#  and make leasing from it available at the module level.
+_dict_pool = DictPool()
+lease_dict = _dict_pool.lease
+discard_pooled_dicts = _dict_pool.discard
+
 #  Expose the "get_version" function.
 def get_enchant_version():
     """Get the version string for the underlying enchant library."""
@@ -46,7 +46,14 @@ such as a wxPython GUI dialog and a command-line interface.
 """
 
 import array
+import bisect
+import itertools
+import os
+import re
+import threading
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import enchant
 from enchant.errors import (
@@ -57,6 +64,103 @@ from enchant.errors import (
 from enchant.tokenize import get_tokenizer
 from enchant.utils import get_default_language
 
+#  Approximate number of characters in each chunk checked by check_parallel().
+PARALLEL_CHUNK_SIZE = 1 << 20
+
+#  Number of words per dictionary call when using check_parallel().
+PARALLEL_BATCH_SIZE = 256
+
+#  Whitespace at which check_parallel() can split the text.
+_WHITESPACE = re.compile(r"\s")
+
+
+class _PieceTable:
+    """Replacements made to an immutable string, without copying it.
+
+    Each replacement is kept as a (start, end, replacement) piece in terms
+    of positions in the original string, and the edited string is only
+    built when it is asked for.  Positions can be mapped between the
+    original and the edited string.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._pieces = []
+        # Start of each piece in the original and the edited string
+        self._starts = []
+        self._edited_starts = []
+        # Change in length caused by each piece and all the pieces before it
+        self._deltas = []
+        self._edited_text = text
+
+    def __len__(self):
+        if self._deltas:
+            return len(self.text) + self._deltas[-1]
+        return len(self.text)
+
+    def replace(self, start, end, replacement):
+        """Replace the given span of the original string."""
+        idx = bisect.bisect_left(self._starts, start)
+        self._pieces.insert(idx, (start, end, replacement))
+        self._starts.insert(idx, start)
+        # Pieces after this one are shifted, so recompute their bookkeeping
+        delta = self._deltas[idx - 1] if idx else 0
+        del self._deltas[idx:]
+        del self._edited_starts[idx:]
+        for (p_start, p_end, p_replacement) in self._pieces[idx:]:
+            self._edited_starts.append(p_start + delta)
+            delta += len(p_replacement) - (p_end - p_start)
+            self._deltas.append(delta)
+        self._edited_text = None
+
+    def edited_end(self):
+        """Get the position in the edited string just after the last replacement."""
+        if not self._pieces:
+            return 0
+        return self._edited_starts[-1] + len(self._pieces[-1][2])
+
+    def is_replaced(self, start, end):
+        """Check whether the given span of the original string was replaced."""
+        idx = bisect.bisect_right(self._starts, start)
+        if idx and self._pieces[idx - 1][1] > start:
+            return True
+        return idx < len(self._starts) and self._starts[idx] < end
+
+    def to_edited(self, pos):
+        """Map a position in the original string to the edited string."""
+        idx = bisect.bisect_left(self._starts, pos)
+        if not idx:
+            return pos
+        (start, end, replacement) = self._pieces[idx - 1]
+        # Positions inside a replaced span map to the end of its replacement
+        return max(pos, end) + self._deltas[idx - 1]
+
+    def to_original(self, pos):
+        """Map a position in the edited string to the original string."""
+        idx = bisect.bisect_right(self._edited_starts, pos) - 1
+        if idx < 0:
+            return pos
+        (start, end, replacement) = self._pieces[idx]
+        edited_start = self._edited_starts[idx]
+        if pos == edited_start:
+            return start
+        if pos < edited_start + len(replacement):
+            return end
+        return pos - self._deltas[idx]
+
+    def get_text(self):
+        """Get the edited string."""
+        if self._edited_text is None:
+            chunks = []
+            last_end = 0
+            for (start, end, replacement) in self._pieces:
+                chunks.append(self.text[last_end:start])
+                chunks.append(replacement)
+                last_end = end
+            chunks.append(self.text[last_end:])
+            self._edited_text = "".join(chunks)
+        return self._edited_text
+
 
 class SpellChecker:
     """Class implementing stateful spellchecking behaviour.
@@ -105,12 +209,42 @@ class SpellChecker:
     'set_offset' method to reposition the internal loop pointer
     to make sure it doesn't skip any words.
 
+    If the 'batch_size' argument is given, words are read ahead from
+    the tokenizer in chunks of that size and checked with a single call
+    to the dictionary's 'check_many' method.  Replacing words works as
+    usual; any other call to 'set_offset' discards the words read ahead
+    and restarts tokenization from the new offset.  Calling 'add' or
+    'remove' checks the words read ahead again, against the changed
+    dictionary.
+
+    If the 'spans' argument is true and the text is a unicode string,
+    the string is tokenized as is rather than copied into an array.
+    Replacements are recorded in a piece table over the original string
+    and only applied when 'get_text' is called, so they no longer shift
+    the rest of the text.  Positions still refer to the edited text, as
+    they do with arrays.  Calling 'set_offset' to move before the end of a
+    replacement rebuilds the edited string and tokenizes it afresh, so
+    replaced words are checked again exactly as they are with arrays.
+
+    If the 'cancelled' argument is given, it must be a callable taking
+    no arguments.  It is called before each word is checked, or before
+    each batch of words in batch mode, and the checking loop stops as
+    if the end of the text was reached once it returns true.
+
     """
 
     _DOC_ERRORS = ["sme", "fw", "speling", "chkr", "chkr", "chkr"]
 
     def __init__(
-        self, lang=None, text=None, tokenize=None, chunkers=None, filters=None
+        self,
+        lang=None,
+        text=None,
+        tokenize=None,
+        chunkers=None,
+        filters=None,
+        batch_size=None,
+        spans=False,
+        cancelled=None,
     ):
         """Constructor for the SpellChecker class.
 
@@ -125,6 +259,9 @@ class SpellChecker:
             * tokenize:  a custom tokenization function to use
             * chunkers:  a list of chunkers to apply during tokenization
             * filters:  a list of filters to apply during tokenization
+            * batch_size:  the number of words to check per dictionary call
+            * spans:  check unicode strings in place, recording replacements
+            * cancelled:  a callable returning true once checking should stop
 
         If <tokenize> is not given and the first argument is a Dict,
         its 'tag' attribute must be a language tag so that a tokenization
@@ -163,7 +300,18 @@ class SpellChecker:
         # Default to the empty string as the text to be checked
         self._text = array.array("u")
         self._use_tostring = False
+        self._spans = spans
+        self._pieces = None
+        self._source_pos = None
         self._tokens = iter([])
+        # Words read ahead in batch mode, as (words, positions, offsets) lists,
+        # and the misspelled ones among them, as indices into those lists
+        self._batch_size = batch_size
+        self._batch = None
+        self._pending = deque()
+        self._pending_index = None
+        self._pending_offset = None
+        self._cancelled = cancelled
 
         if text is not None:
             self.set_text(text)
@@ -178,8 +326,13 @@ class SpellChecker:
         This method must be called, or the 'text' argument supplied
         to the constructor, before calling the 'next()' method.
         """
+        self._pieces = None
+        if self._spans and type(text) is str:
+            self._text = text
+            self._pieces = _PieceTable(text)
+            self._use_tostring = True
         # Convert to an array object if necessary
-        if isinstance(text, (str, bytes)):
+        elif isinstance(text, (str, bytes)):
             if type(text) is str:
                 self._text = array.array("u", text)
             else:
@@ -189,15 +342,26 @@ class SpellChecker:
             self._text = text
             self._use_tostring = False
         self._tokens = self._tokenize(self._text)
+        self._discard_pending()
 
     def get_text(self):
         """Return the spell-checked text."""
+        if self._pieces is not None:
+            return self._pieces.get_text()
         if self._use_tostring:
             return self._array_to_string(self._text)
         return self._text
 
+    def _get_current_text(self):
+        """Get the text being checked, with the replacements made so far."""
+        if self._pieces is not None:
+            return self._pieces.get_text()
+        return self._text
+
     def _array_to_string(self, text):
         """Format an internal array as a standard string."""
+        if isinstance(text, str):
+            return text
         if text.typecode == "u":
             return text.tounicode()
         return text.tostring()
@@ -209,7 +373,7 @@ class SpellChecker:
         as input, False if it wants normal strings.  It's important to
         provide the correct type of string to the checker.
         """
-        if self._text.typecode == "u":
+        if self._pieces is not None or self._text.typecode == "u":
             return True
         return False
 
@@ -257,13 +421,17 @@ class SpellChecker:
         # The uncaught StopIteration from next(self._tokens)
         # will provide the StopIteration for this method
         while True:
-            (word, pos) = next(self._tokens)
-            # decode back to a regular string
-            word = self._array_to_string(word)
-            if self.dict.check(word):
+            (word, pos, correct) = self._next_checked_token()
+            if correct:
                 continue
             if word in self._ignore_words:
                 continue
+            if self._pieces is not None:
+                # Words that were replaced are not checked again
+                if self._pieces.is_replaced(pos, pos + len(word)):
+                    continue
+                self._source_pos = pos
+                pos = self._pieces.to_edited(pos)
             self.word = word
             self.wordpos = pos
             if word in self._replace_words:
@@ -272,15 +440,84 @@ class SpellChecker:
             break
         return self
 
+    def _next_checked_token(self):
+        """Get the next token along with whether it is correctly spelled.
+
+        This returns a tuple (word, pos, correct).  In batch mode only
+        misspelled words are returned, from those read ahead, which are
+        refilled from the tokenizer when exhausted.
+        """
+        if self._batch_size is None:
+            if self._cancelled is not None and self._cancelled():
+                raise StopIteration
+            (word, pos) = next(self._tokens)
+            # decode back to a regular string
+            word = self._array_to_string(word)
+            return (word, pos, self.dict.check(word))
+        while not self._pending:
+            self._read_ahead()
+        idx = self._pending.popleft()
+        (words, positions, offsets) = self._batch
+        self._pending_index = idx
+        self._pending_offset = offsets[idx]
+        return (words[idx], positions[idx], False)
+
+    def _read_ahead(self):
+        """Read and check the next batch of tokens, keeping the misspelled ones."""
+        if self._cancelled is not None and self._cancelled():
+            raise StopIteration
+        tokens = self._tokens
+        words = []
+        positions = []
+        offsets = []
+        for (word, pos) in itertools.islice(tokens, self._batch_size):
+            words.append(word)
+            positions.append(pos)
+            # Remember where the tokenizer was after each word, so the
+            # loop can be repositioned as if we had not read ahead.
+            offsets.append(tokens.offset)
+        if not words:
+            raise StopIteration
+        if self._pieces is None:
+            # Span mode already yields strings
+            words = [self._array_to_string(word) for word in words]
+        self._batch = (words, positions, offsets)
+        self._pending.extend(self.dict.check_many(words))
+
+    def _discard_pending(self):
+        """Forget any words read ahead in batch mode."""
+        self._batch = None
+        self._pending.clear()
+        self._pending_index = None
+        self._pending_offset = None
+
+    def _get_tokens_offset(self):
+        """Get the tokenizer offset just after the current word."""
+        if self._pending_offset is not None:
+            return self._pending_offset
+        return self._tokens.offset
+
     def replace(self, repl):
         """Replace the current erroneous word with the given string."""
         repl = self.coerce_string(repl)
+        if self._pieces is not None:
+            if repl:
+                self.dict.store_replacement(self.word, repl)
+            end = self._source_pos + len(self.word)
+            self._pieces.replace(self._source_pos, end, repl)
+            # The original text doesn't move, so the offset needs no adjustment
+            offset = self._get_tokens_offset()
+            self._discard_pending()
+            self._tokens.set_offset(offset, replaced=True)
+            return
         a_repl = array.array(self._text.typecode, repl)
         if repl:
             self.dict.store_replacement(self.word, repl)
         self._text[self.wordpos : self.wordpos + len(self.word)] = a_repl
         incr = len(repl) - len(self.word)
-        self._tokens.set_offset(self._tokens.offset + incr, replaced=True)
+        offset = self._get_tokens_offset()
+        self._discard_pending()
+        self._tokens.set_offset(offset + incr, replaced=True)
 
     def replace_always(self, word, repl=None):
         """Always replace given word with given replacement.
@@ -330,6 +567,29 @@ class SpellChecker:
         if word is None:
             word = self.word
         self.dict.add(word)
+        self._recheck_pending()
+
+    def remove(self, word=None):
+        """Add given word to the personal exclude list.
+
+        If no word is given, the current erroneous word is excluded.
+        """
+        if word is None:
+            word = self.word
+        self.dict.remove(word)
+        self._recheck_pending()
+
+    def _recheck_pending(self):
+        """Check the words read ahead again, after the dictionary changed."""
+        if self._batch is None:
+            return
+        # Rather than tokenizing again, which would lose the rest of a
+        # split word (e.g. "y" in "x.y"), check the words after this one
+        start = self._pending_index + 1
+        self._pending.clear()
+        self._pending.extend(
+            start + idx for idx in self.dict.check_many(self._batch[0][start:])
+        )
 
     def suggest(self, word=None):
         """Return suggested spellings for the given word.
@@ -357,16 +617,47 @@ class SpellChecker:
             * 1 treats <off> as a distance from the start
             * 2 treats <off> as a distance from the end
         """
+        pieces = self._pieces
         if whence == 0:
-            self._tokens.set_offset(self._tokens.offset + off)
+            current = self._get_tokens_offset()
+            if pieces is not None:
+                current = pieces.to_edited(current)
+            off = current + off
         elif whence == 1:
             assert off > 0
-            self._tokens.set_offset(off)
         elif whence == 2:
             assert off > 0
-            self._tokens.set_offset(len(self._text) - 1 - off)
+            off = len(pieces if pieces is not None else self._text) - 1 - off
         else:
             raise ValueError("Invalid value for whence: %s" % (whence,))
+        if pieces is not None:
+            if off < pieces.edited_end():
+                # Replaced text lies ahead, which only the edited string holds
+                self._rebase_pieces(off)
+                return
+            off = pieces.to_original(off)
+        if self._pending_offset is None:
+            self._tokens.set_offset(off)
+        else:
+            # The tokenizer has moved past the current word, start afresh.
+            self._discard_pending()
+            self._tokens.set_offset(off, replaced=True)
+
+    def _rebase_pieces(self, off):
+        """Tokenize the edited text from the given offset onwards.
+
+        The replacements made so far are applied, and the edited string
+        becomes the original string of a new, empty piece table.
+        """
+        text = self._pieces.get_text()
+        if self.wordpos is not None:
+            # The current word can still be replaced, at its edited position
+            self._source_pos = self.wordpos
+        self._text = text
+        self._pieces = _PieceTable(text)
+        self._tokens = self._tokenize(text)
+        self._discard_pending()
+        self._tokens.set_offset(off)
 
     def leading_context(self, chars):
         """Get <chars> characters of leading context.
@@ -376,7 +667,7 @@ class SpellChecker:
         before the current erroneous word.
         """
         start = max(self.wordpos - chars, 0)
-        context = self._text[start : self.wordpos]
+        context = self._get_current_text()[start : self.wordpos]
         return self._array_to_string(context)
 
     def trailing_context(self, chars):
@@ -386,7 +677,152 @@ class SpellChecker:
         context - the text that occurs in the string immediately
         after the current erroneous word.
         """
+        text = self._get_current_text()
         start = self.wordpos + len(self.word)
-        end = min(start + chars, len(self._text))
-        context = self._text[start:end]
+        end = min(start + chars, len(text))
+        context = text[start:end]
         return self._array_to_string(context)
+
+
+def _split_text(text, chunk_size):
+    """Split a string into (offset, chunk) pairs of about <chunk_size> chars.
+
+    Chunks end at a line break where possible, otherwise at the next
+    whitespace character.  The tokenizers never join words across
+    whitespace, so checking each chunk on its own finds the same words
+    as checking the whole string.
+    """
+    length = len(text)
+    start = 0
+    while start < length:
+        end = start + chunk_size
+        if end >= length:
+            end = length
+        else:
+            split = text.rfind("\n", start + 1, end)
+            if split != -1:
+                end = split
+            else:
+                match = _WHITESPACE.search(text, end)
+                end = match.start() if match else length
+        yield (start, text[start:end])
+        start = end
+
+
+class _WorkerDicts:
+    """Dicts made by a factory for the workers of one check_parallel() call.
+
+    Each worker thread gets its own Dict, created on a Broker of its own:
+    a Broker hands out the same handle for every Dict of a language.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._dicts = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get the Dict of the current worker, creating it if needed."""
+        dict = getattr(self._local, "dict", None)
+        if dict is None:
+            dict = self._local.dict = self._factory(enchant.Broker())
+            with self._lock:
+                self._dicts.append(dict)
+        return dict
+
+    def free(self):
+        """Free all the Dicts created so far."""
+        with self._lock:
+            (dicts, self._dicts) = (self._dicts, [])
+        for dict in dicts:
+            dict._free()
+
+
+def _check_chunk(lang, offset, text, filters, batch_size):
+    """Check one chunk of text on behalf of check_parallel()."""
+    if not isinstance(lang, str):
+        return _find_errors(lang.get(), offset, text, filters, batch_size)
+    with enchant.lease_dict(lang) as dict:
+        return _find_errors(dict, offset, text, filters, batch_size)
+
+
+def _find_errors(dict, offset, text, filters, batch_size):
+    """Find the spelling errors in a chunk of text starting at <offset>."""
+    chkr = SpellChecker(dict, filters=filters, batch_size=batch_size, spans=True)
+    chkr.set_text(text)
+    return [(err.word, err.wordpos + offset) for err in chkr]
+
+
+def check_parallel(
+    lang,
+    text,
+    workers=None,
+    executor=None,
+    filters=None,
+    chunk_size=PARALLEL_CHUNK_SIZE,
+    batch_size=PARALLEL_BATCH_SIZE,
+):
+    """Find the spelling errors in a large unicode string concurrently.
+
+    The string is split at line breaks or whitespace into chunks of about
+    <chunk_size> characters, which are checked at the same time.  This
+    returns a list of (word, pos) tuples in increasing order of position,
+    the same as the 'word' and 'wordpos' attributes a SpellChecker reports
+    when going over the whole string without making replacements.
+
+    A Dict must not be used by several threads at once, so each worker
+    checks with a Dict of its own.  The argument <lang> is either a
+    language tag, for which Dicts are leased from the pool behind
+    enchant.lease_dict(), or a factory.  With a tag, no more chunks are
+    checked at once than the pool has Dicts for a language.  A factory
+    is called with a new Broker as its only argument and must return a
+    Dict requested from that Broker, for example:
+
+        lambda broker: enchant.DictWithPWL("en_US", "words.txt", broker=broker)
+
+    Each worker thread calls the factory once, and the Dicts it returns
+    are freed before check_parallel() returns.
+
+    By default the chunks are checked on <workers> threads, one per CPU
+    if not given.  Tokenizing and looking up cached verdicts hold the GIL,
+    and only the words missing from the verdict cache reach the provider
+    with the GIL released, so threads give little or no speedup over a
+    single SpellChecker.  Checking in parallel needs a concurrent.futures
+    ProcessPoolExecutor as <executor>, with a language tag as <lang> so
+    that each process reuses the Dicts in its pool.  Applications that
+    can't start Python processes of their own, such as those embedding
+    Python, should use a SpellChecker instead.
+    """
+    chunks = list(_split_text(text, chunk_size))
+    worker_dicts = None
+    if not isinstance(lang, str):
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError("a Dict factory can only be used with worker threads")
+        lang = worker_dicts = _WorkerDicts(lang)
+    own_executor = executor is None
+    if own_executor:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(chunks)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        for (offset, chunk) in chunks:
+            futures.append(
+                executor.submit(
+                    _check_chunk, lang, offset, chunk, filters, batch_size
+                )
+            )
+        return list(
+            itertools.chain.from_iterable(future.result() for future in futures)
+        )
+    finally:
+        # Don't free the Dicts while a worker may still be using them
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        if own_executor:
+            executor.shutdown()
+        if worker_dicts is not None:
+            worker_dicts.free()
@@ -0,0 +1,634 @@
+# pyenchant
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+"""
+
+compiled:  memory-mapped precompiled Hunspell dictionaries
+==========================================================
+
+This module provides a pure-python dictionary that answers spelling
+queries from a precompiled, memory-mappable word table instead of having
+Hunspell parse the .dic/.aff files on every load.
+
+A Hunspell dictionary is compiled once with compile_hunspell_dictionary(),
+which expands the affix rules of every root word and writes the resulting
+word forms as a sorted string table.  Loading a compiled dictionary is
+then a single mmap with no parsing, and since the file is mapped read-only
+its pages are shared between every process that uses it.
+
+The compiler handles prefixes, suffixes and their cross products, as well
+as flag aliases (AF), which covers the large majority of Hunspell
+dictionaries.  Compounding and
+two-level affixes are not expanded, so languages relying on them will
+report some valid words as misspelled; use compare_verdicts() to measure
+the difference against Hunspell before enabling a language.  Word forms
+are sorted in bounded runs on disk, so compiling doesn't need memory for
+every form of the dictionary at once.
+
+"""
+
+import bisect
+import contextlib
+import heapq
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+
+from enchant.pypwl import PyPWL
+
+
+# File layout: header, then (count + 1) little-endian offsets, then the words blob
+_MAGIC = b"SCDX"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHHII")
+_OFFSET = struct.Struct("<I")
+# Header flags
+_TURKIC_CASING = 1
+
+_DEFAULT_TRY = "esianrtolcdugmphbyfvkwzESIANRTOLCDUGMPHBYFVKWZ'"
+
+# Hunspell accepts numbers, with single dots, commas or dashes between the digits
+_NUMBER = re.compile(r"[0-9]+(?:[.,-][0-9]+)*")
+
+# Word forms held in memory while compiling, the rest are sorted in runs on disk
+_SORT_RUN_SIZE = 1 << 19
+
+
+class _Casing:
+    """The case mappings Hunspell applies to words of most languages."""
+
+    def lower(self, word):
+        return word.lower()
+
+    def upper(self, word):
+        return word.upper()
+
+    def capitalize(self, word):
+        return self.upper(word[:1]) + self.lower(word[1:])
+
+
+class _TurkicCasing(_Casing):
+    """The case mappings of Turkic languages, which pair I with dotless ı and İ with i."""
+
+    def lower(self, word):
+        return word.replace("I", "ı").replace("İ", "i").lower()
+
+    def upper(self, word):
+        return word.replace("i", "İ").upper()
+
+
+# Languages whose affix files get Turkic case mappings from Hunspell
+_TURKIC_LANGUAGES = ("az", "crh", "tr")
+
+
+class _AffixRule:
+    """A single PFX/SFX rule of a Hunspell affix file."""
+
+    def __init__(self, is_suffix, strip, add, condition):
+        self.is_suffix = is_suffix
+        self.strip = "" if strip == "0" else strip
+        # Continuation flags on the affix are not expanded, only checked by _AffixFile
+        (add, _, self.continuation) = add.partition("/")
+        self.add = "" if add == "0" else add
+        self.excluded = False
+        if condition in ("", "."):
+            self._condition = None
+        else:
+            pattern = condition + "$" if is_suffix else "^" + condition
+            self._condition = re.compile(pattern)
+
+    def apply(self, word):
+        """Return the word with this affix applied, or None if it doesn't apply."""
+        if self._condition is not None and not self._condition.search(word):
+            return None
+        if self.is_suffix:
+            if self.strip:
+                if not word.endswith(self.strip):
+                    return None
+                word = word[: -len(self.strip)]
+            return word + self.add
+        if self.strip:
+            if not word.startswith(self.strip):
+                return None
+            word = word[len(self.strip) :]
+        return self.add + word
+
+
+class _AffixFile:
+    """The parts of a Hunspell affix file needed to expand a word list."""
+
+    def __init__(self, filename):
+        self.encoding = "ISO8859-1"
+        self.flag_type = "short"
+        self.try_chars = _DEFAULT_TRY
+        self.casing = _Casing()
+        # Words and affixes with these flags are left out, along with their forms
+        self.excluded_flags = set()
+        # Words with these flags are only valid with an affix
+        self.need_affix_flags = set()
+        # Flag sets referred to by number when the affix file uses AF
+        self.flag_aliases = []
+        # flag -> (is_suffix, cross_product, rules)
+        self.affixes = {}
+        with open(filename, "rb") as f:
+            raw = f.read()
+        match = re.search(rb"^\s*SET\s+(\S+)", raw, re.MULTILINE)
+        if match is not None:
+            self.encoding = match.group(1).decode("ascii", "replace")
+        text = raw.decode(self._python_encoding(self.encoding), "replace")
+        self._parse(text)
+
+    @staticmethod
+    def _python_encoding(encoding):
+        encoding = encoding.lower()
+        if encoding.startswith("microsoft-cp"):
+            return "cp" + encoding[len("microsoft-cp") :]
+        if encoding == "iscii-devanagari":
+            return "utf-8"
+        return encoding
+
+    def _parse(self, text):
+        lines = iter(text.splitlines())
+        for line in lines:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            keyword = fields[0]
+            if keyword == "FLAG" and len(fields) > 1:
+                self.flag_type = fields[1]
+            elif keyword == "TRY" and len(fields) > 1:
+                self.try_chars = fields[1]
+            elif keyword == "LANG" and len(fields) > 1:
+                if fields[1].split("_")[0] in _TURKIC_LANGUAGES:
+                    self.casing = _TurkicCasing()
+            elif keyword == "AF" and len(fields) > 1 and fields[1].isdigit():
+                # The first AF line holds the number of aliases that follow
+                if not self.flag_aliases:
+                    for _ in range(int(fields[1])):
+                        alias_fields = next(lines, "").split()
+                        if len(alias_fields) > 1 and alias_fields[0] == "AF":
+                            self.flag_aliases.append(alias_fields[1])
+                        else:
+                            self.flag_aliases.append("")
+            elif keyword in ("FORBIDDENWORD", "ONLYINCOMPOUND"):
+                if len(fields) > 1:
+                    self.excluded_flags.update(self.parse_flags(fields[1]))
+            elif keyword == "NEEDAFFIX" and len(fields) > 1:
+                self.need_affix_flags.update(self.parse_flags(fields[1]))
+            elif keyword in ("PFX", "SFX") and len(fields) == 4:
+                (flag, cross_product, count) = fields[1:4]
+                rules = []
+                for _ in range(int(count)):
+                    rule_fields = next(lines, "").split()
+                    if len(rule_fields) < 4 or rule_fields[0] != keyword:
+                        continue
+                    condition = rule_fields[4] if len(rule_fields) > 4 else "."
+                    try:
+                        rules.append(
+                            _AffixRule(
+                                keyword == "SFX", rule_fields[2], rule_fields[3], condition
+                            )
+                        )
+                    except re.error:
+                        continue
+                self.affixes[flag] = (keyword == "SFX", cross_product == "Y", rules)
+        # The affixed forms of these rules need another affix, or are parts of compounds
+        for (_, _, rules) in self.affixes.values():
+            for rule in rules:
+                flags = self._resolve_flags(rule.continuation)
+                rule.excluded = not (
+                    self.excluded_flags.isdisjoint(flags)
+                    and self.need_affix_flags.isdisjoint(flags)
+                )
+
+    def parse_flags(self, flags):
+        if self.flag_type == "long":
+            return [flags[i : i + 2] for i in range(0, len(flags), 2)]
+        if self.flag_type == "num":
+            return [flag.strip() for flag in flags.split(",") if flag.strip()]
+        return list(flags)
+
+    def _resolve_flags(self, flags):
+        if self.flag_aliases and flags.isdigit():
+            # The flags refer to one of the flag sets defined by AF
+            index = int(flags) - 1
+            if 0 <= index < len(self.flag_aliases):
+                flags = self.flag_aliases[index]
+            else:
+                flags = ""
+        return self.parse_flags(flags)
+
+    def expand(self, word, flags):
+        """Yield every form of the root word given its affix flags."""
+        flags = self._resolve_flags(flags)
+        if not self.excluded_flags.isdisjoint(flags):
+            return
+        if self.need_affix_flags.isdisjoint(flags):
+            yield word
+        suffixed = []
+        prefixes = []
+        for flag in flags:
+            try:
+                (is_suffix, cross_product, rules) = self.affixes[flag]
+            except KeyError:
+                continue
+            if not is_suffix:
+                prefixes.append((cross_product, rules))
+                continue
+            for rule in rules:
+                form = None if rule.excluded else rule.apply(word)
+                if form is not None:
+                    yield form
+                    if cross_product:
+                        suffixed.append(form)
+        for (cross_product, rules) in prefixes:
+            for rule in rules:
+                if rule.excluded:
+                    continue
+                form = rule.apply(word)
+                if form is not None:
+                    yield form
+                if cross_product:
+                    for suffixed_form in suffixed:
+                        form = rule.apply(suffixed_form)
+                        if form is not None:
+                            yield form
+
+
+def _with_hidden_forms(forms, casing):
+    """Yield the given word forms along with the upper case forms Hunspell accepts.
+
+    Hunspell accepts mixed case words written in upper case, such as
+    "MCMAHON" for "McMahon" or "IPOD" for "iPod", which CompiledDict.check()
+    can't derive from the upper case word, so those forms are stored too.
+    Hyphenated words are only stored when a part of them is mixed case,
+    since Hunspell doesn't accept "COOK-TOGO" for "Cook-Togo".
+    """
+    for form in forms:
+        yield form
+        if any(part[1:] != casing.lower(part[1:]) for part in form.split("-")):
+            upper = casing.upper(form)
+            if upper != form:
+                yield upper
+
+
+def _read_dic_words(filename, affix_file):
+    encoding = affix_file._python_encoding(affix_file.encoding)
+    with open(filename, "r", encoding=encoding, errors="replace") as f:
+        # The first line holds the approximate number of words
+        next(f, None)
+        for line in f:
+            fields = line.split()
+            if not fields or line[0].isspace():
+                continue
+            entry = fields[0]
+            # A slash escaped with a backslash is part of the word
+            (word, _, flags) = entry.replace("\\/", "\0").partition("/")
+            yield word.replace("\0", "/"), flags
+
+
+def _write_sorted_runs(forms, directory, run_size, max_forms):
+    """Sort the given word forms in runs of <run_size> unique forms.
+
+    Runs that don't fit in memory are written to files in <directory>,
+    one encoded form per line.  Returns the sorted forms of the last run
+    if no run was written, and the names of the run files.
+    """
+    run_files = []
+    run = set()
+    count = 0
+    for form in forms:
+        count += 1
+        if max_forms is not None and count > max_forms:
+            raise ValueError(f"The dictionary expands to more than {max_forms} words")
+        run.add(form.encode("utf-8"))
+        if len(run) >= run_size:
+            run_files.append(_write_run(run, directory, len(run_files)))
+            run = set()
+    if not run_files:
+        return (sorted(run), run_files)
+    if run:
+        run_files.append(_write_run(run, directory, len(run_files)))
+    return ([], run_files)
+
+
+def _write_run(run, directory, index):
+    filename = os.path.join(directory, f"run{index}")
+    with open(filename, "wb") as f:
+        for word in sorted(run):
+            f.write(word)
+            f.write(b"\n")
+    return filename
+
+
+def compile_hunspell_dictionary(
+    dic_filename, aff_filename, output_filename, max_forms=None
+):
+    """Compile a Hunspell dictionary into a memory-mappable word table.
+
+    This method expands every word of the given .dic file using the
+    rules of the .aff file, and writes the resulting word forms in
+    sorted order to <output_filename>.  It returns the number of forms.
+
+    Forms are sorted in bounded runs merged from disk, so the memory
+    used doesn't grow with the size of the dictionary.  Dictionaries
+    whose roots expand to more than <max_forms> forms, or whose forms
+    don't fit the 32-bit offsets of the format, raise ValueError.
+
+    The output is written to a uniquely named temporary file first and
+    moved into place once complete, so concurrent compiles never write
+    to the same file.
+    """
+    affix_file = _AffixFile(aff_filename)
+    forms = (
+        form
+        for (word, flags) in _read_dic_words(dic_filename, affix_file)
+        for form in _with_hidden_forms(affix_file.expand(word, flags), affix_file.casing)
+        if form
+    )
+    try_chars = affix_file.try_chars.encode("utf-8")
+    header_flags = _TURKIC_CASING if isinstance(affix_file.casing, _TurkicCasing) else 0
+    output_directory = os.path.dirname(os.path.abspath(output_filename))
+    (fd, temp_filename) = tempfile.mkstemp(
+        suffix=".tmp",
+        prefix=os.path.basename(output_filename) + ".",
+        dir=output_directory,
+    )
+    try:
+        with open(fd, "wb") as f, tempfile.TemporaryDirectory(
+            dir=output_directory
+        ) as runs_directory, contextlib.ExitStack() as stack:
+            (sorted_forms, run_files) = _write_sorted_runs(
+                forms, runs_directory, _SORT_RUN_SIZE, max_forms
+            )
+            runs = [sorted_forms]
+            for filename in run_files:
+                run_file = stack.enter_context(open(filename, "rb"))
+                runs.append(line[:-1] for line in run_file)
+            words = stack.enter_context(tempfile.TemporaryFile(dir=runs_directory))
+            # The offsets come before the words, whose count is only known at the end
+            f.write(_HEADER.pack(_MAGIC, _VERSION, header_flags, 0, len(try_chars)))
+            f.write(try_chars)
+            count = 0
+            offset = 0
+            previous = None
+            for word in heapq.merge(*runs):
+                if word == previous:
+                    continue
+                previous = word
+                f.write(_OFFSET.pack(offset))
+                words.write(word)
+                count += 1
+                offset += len(word)
+                if offset > 0xFFFFFFFF:
+                    raise ValueError("The dictionary is too large to be compiled")
+            f.write(_OFFSET.pack(offset))
+            words.seek(0)
+            shutil.copyfileobj(words, f)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, _VERSION, header_flags, count, len(try_chars)))
+        os.replace(temp_filename, output_filename)
+    except BaseException:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+compile_hunspell_dictionary._DOC_ERRORS = ["dic", "aff"]
+
+
+class _WordTable:
+    """Read-only sequence view over the sorted words of a compiled dictionary."""
+
+    def __init__(self, buffer):
+        (magic, version, flags, count, try_length) = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a compiled dictionary")
+        self.casing = _TurkicCasing() if flags & _TURKIC_CASING else _Casing()
+        offset = _HEADER.size
+        self.try_chars = bytes(buffer[offset : offset + try_length]).decode("utf-8")
+        self._buffer = buffer
+        self._count = count
+        self._offsets_start = offset + try_length
+        self._words_start = self._offsets_start + (count + 1) * _OFFSET.size
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        position = self._offsets_start + index * _OFFSET.size
+        (start,) = _OFFSET.unpack_from(self._buffer, position)
+        (end,) = _OFFSET.unpack_from(self._buffer, position + _OFFSET.size)
+        return self._buffer[self._words_start + start : self._words_start + end]
+
+    def __contains__(self, word):
+        word = word.encode("utf-8")
+        index = bisect.bisect_left(self, word)
+        return index < self._count and self[index] == word
+
+
+class CompiledDict:
+    """Dictionary backed by a precompiled, memory-mapped word table.
+    This class emulates the Dict objects provided by PyEnchant, but
+    answers queries from a file created by compile_hunspell_dictionary().
+    """
+
+    def __init__(self, filename, tag=None, pwl=None, pel=None):
+        """CompiledDict constructor.
+        This method takes the name of a compiled dictionary file and,
+        optionally, the language tag it should report.
+
+        As with DictWithPWL, the arguments 'pwl' and 'pel' name the files
+        holding the personal word list and the personal exclude list,
+        which are created if they don't exist.  Words added to or removed
+        from the dictionary are written to them.  If either is None, an
+        in-memory list is used instead.
+        """
+        self.provider = None
+        self.filename = os.path.abspath(filename)
+        self.tag = tag if tag is not None else self.filename
+        with open(self.filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._words = _WordTable(self._mmap)
+        except Exception:
+            self._mmap.close()
+            raise
+        self.pwl = self._open_word_list(pwl)
+        self.pel = self._open_word_list(pel)
+        self._added = set()
+        self._removed = set()
+
+    @staticmethod
+    def _open_word_list(filename):
+        if filename is None:
+            return PyPWL()
+        if not os.path.exists(filename):
+            open(filename, "wt").close()
+        return PyPWL(filename)
+
+    def _lookup(self, word):
+        if word in self._removed or self.pel.check(word):
+            return False
+        return word in self._added or self.pwl.check(word) or word in self._words
+
+    def check(self, word):
+        """Check spelling of a word.
+
+        This method takes a word in the dictionary language and returns
+        True if it is correctly spelled, and false otherwise.  Like
+        Hunspell, capitalized and upper case forms of a lower case
+        word are accepted, and so are numbers.
+        """
+        if not word:
+            return False
+        if _NUMBER.fullmatch(word) or self._lookup(word):
+            return True
+        casing = self._words.casing
+        if word.isupper():
+            return self._lookup(casing.lower(word)) or self._lookup(casing.capitalize(word))
+        if word[0].isupper() and word[1:] == casing.lower(word[1:]):
+            return self._lookup(casing.lower(word[0]) + word[1:])
+        return False
+
+    def check_many(self, words):
+        """Check spelling of several words at once.
+
+        This method returns a list holding the indices of the given
+        words that are not correctly spelled, in increasing order.
+        """
+        return [idx for (idx, word) in enumerate(words) if not self.check(word)]
+
+    def suggest(self, word):
+        """Suggest possible spellings for a word.
+
+        This method returns the correctly spelled words that are a
+        single edit (deletion, transposition, substitution or insertion
+        using the TRY characters of the affix file) away from the given
+        word, in that order.
+        """
+        limit = 10
+        casing = self._words.casing
+        is_upper = len(word) > 1 and word.isupper()
+        is_title = word[:1].isupper() and not is_upper
+        lowered = casing.lower(word) if (is_upper or is_title) else word
+        res = []
+        for candidate in self._edits(lowered):
+            if is_upper:
+                candidate = casing.upper(candidate)
+            elif is_title:
+                candidate = casing.upper(candidate[:1]) + candidate[1:]
+            if candidate != word and candidate not in res and self.check(candidate):
+                res.append(candidate)
+                if len(res) == limit:
+                    break
+        return res
+
+    def _edits(self, word):
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        for (left, right) in splits:
+            if right:
+                yield left + right[1:]
+        for (left, right) in splits:
+            if len(right) > 1:
+                yield left + right[1] + right[0] + right[2:]
+        for (left, right) in splits:
+            if right:
+                for c in self._words.try_chars:
+                    yield left + c + right[1:]
+        for (left, right) in splits:
+            for c in self._words.try_chars:
+                yield left + c + right
+
+    def add(self, word):
+        """Add a word to the personal word list."""
+        self.pwl.add(word)
+        if self.pel.check(word):
+            self.pel.remove(word)
+            # Enchant reads the same files but not their journals
+            self.pel.compact()
+        self._removed.discard(word)
+
+    def add_to_session(self, word):
+        """Add a word to the session list."""
+        self._removed.discard(word)
+        self._added.add(word)
+
+    def remove(self, word):
+        """Add a word to the personal exclude list."""
+        if self.pwl.check(word):
+            self.pwl.remove(word)
+            self.pwl.compact()
+        self.pel.add(word)
+        self._added.discard(word)
+
+    def remove_from_session(self, word):
+        """Add a word to the session exclude list."""
+        self._added.discard(word)
+        self._removed.add(word)
+
+    def store_replacement(self, mis, cor):
+        """Store a replacement spelling for a miss-spelled word.
+
+        Replacements are not used when ranking suggestions from a
+        compiled dictionary, so this method does nothing.
+        """
+        pass
+
+    store_replacement._DOC_ERRORS = ["mis", "mis"]
+
+    def is_added(self, word):
+        """Check whether a word is in the personal or session word list."""
+        return word in self._added or self.pwl.check(word)
+
+    def is_removed(self, word):
+        """Check whether a word is in the personal or session exclude list."""
+        return word in self._removed or self.pel.check(word)
+
+    #  No-op methods to support internal use as a Dict() replacement
+
+    def _check_this(self, msg):
+        pass
+
+    def _free(self):
+        self.pwl._free()
+        self.pel._free()
+        if self._mmap is not None:
+            self._words = None
+            self._mmap.close()
+            self._mmap = None
+
+
+def compare_verdicts(dictionary, reference, words):
+    """Compare the verdicts of two dictionaries over the given words.
+
+    This is the correctness harness for compiled dictionaries: pass a
+    CompiledDict and the Hunspell backed Dict for the same language,
+    along with a list of words to check.  It returns a list of
+    (word, verdict, reference_verdict) tuples for every disagreement.
+    """
+    words = list(words)
+    misspelled = set(dictionary.check_many(words))
+    reference_misspelled = set(reference.check_many(words))
+    return [
+        (word, idx not in misspelled, idx not in reference_misspelled)
+        for (idx, word) in enumerate(words)
+        if (idx in misspelled) != (idx in reference_misspelled)
+    ]
@@ -44,47 +44,73 @@ prototype for the C version found in Enchant).
 """
 
 
+import array
+import heapq
 import os
 import warnings
 
 
+#  Number of journalled changes after which the word list is compacted.
+#  Enchant reads the word list file but not its journal, so this is kept low.
+JOURNAL_COMPACT_THRESHOLD = 64
+
+
 class Trie:
     """Class implementing a trie-based dictionary of words.
 
     A Trie is a recursive data structure storing words by their prefix.
     "Fuzzy matching" can be done by allowing a certain number of missteps
     when traversing the Trie.
+
+    Rather than one Python object per node, the nodes are stored in flat
+    arrays: each node records the character leading to it, its first
+    child and its next sibling, with siblings kept in sorted order.  New
+    nodes are appended at the end, so words can still be inserted one at
+    a time.
     """
 
     def __init__(self, words=()):
-        self._eos = False  # whether I am the end of a word
-        self._keys = {}  # letters at this level of the trie
+        # Node 0 is the root, -1 marks a missing child or sibling
+        self._labels = array.array("I", [0])  # code point leading to each node
+        self._first_child = array.array("i", [-1])
+        self._next_sibling = array.array("i", [-1])
+        self._eos = bytearray(1)  # whether each node is the end of a word
         for w in words:
             self.insert(w)
 
     def insert(self, word):
-        if word == "":
-            self._eos = True
-        else:
-            key = word[0]
-            try:
-                subtrie = self[key]
-            except KeyError:
-                subtrie = Trie()
-                self[key] = subtrie
-            subtrie.insert(word[1:])
+        node = 0
+        for c in word:
+            child = self._child(node, c)
+            if child == -1:
+                child = self._add_child(node, ord(c))
+            node = child
+        self._eos[node] = 1
 
     def remove(self, word):
-        if word == "":
-            self._eos = False
-        else:
-            key = word[0]
-            try:
-                subtrie = self[key]
-            except KeyError:
-                pass
-            else:
-                subtrie.remove(word[1:])
+        node = self._find(word)
+        if node != -1:
+            self._eos[node] = 0
+
+    def __contains__(self, word):
+        """Check whether the given word is in the trie, without any errors.
+
+        This takes one step per character of <word>, unlike search()
+        which also explores every fuzzy branch.
+        """
+        labels = self._labels
+        first_child = self._first_child
+        next_sibling = self._next_sibling
+        node = 0
+        for c in word:
+            code = ord(c)
+            child = first_child[node]
+            while child != -1 and labels[child] < code:
+                child = next_sibling[child]
+            if child == -1 or labels[child] != code:
+                return False
+            node = child
+        return bool(self._eos[node])
 
     def search(self, word, nerrs=0):
         """Search for the given word, possibly making errors.
@@ -92,69 +118,196 @@ class Trie:
         This method searches the trie for the given <word>, making
         precisely <nerrs> errors.  It returns a list of words found.
         """
+        return self._search(0, word, nerrs)
+
+    search._DOC_ERRORS = ["nerrs"]
+
+    def nearest(self, word, max_distance, limit=None):
+        """Find the words closest to the given word.
+
+        This method walks the trie computing a row of the Levenshtein
+        distance table for each node it visits.  Nodes are visited in
+        order of the smallest distance any word below them could have,
+        so the walk stops as soon as the remaining nodes can neither be
+        within <max_distance> of <word> nor beat the closest <limit>
+        words found so far.  It returns a list of (distance, word) tuples
+        ordered by distance, then alphabetically.
+        """
+        columns = len(word) + 1
+        found = []
+        bound = max_distance
+        # Entries are (lowest reachable distance, order, node, prefix, row)
+        queue = [(0, 0, 0, "", list(range(columns)))]
+        pushed = 1
+        while queue:
+            (lowest, _, node, prefix, prev_row) = heapq.heappop(queue)
+            if lowest > bound:
+                break
+            if self._eos[node] and prev_row[-1] <= bound:
+                found.append((prev_row[-1], prefix))
+                if limit is not None and len(found) >= limit:
+                    # Only words at least as close as the worst kept one can make it now
+                    found.sort()
+                    del found[limit:]
+                    bound = found[-1][0]
+            depth = len(prefix) + 1
+            # Cells further than the bound from the diagonal can't be within it
+            outside = bound + 1
+            start = max(1, depth - bound)
+            end = min(columns, depth + bound + 1)
+            for child in self._children(node):
+                c = chr(self._labels[child])
+                row = [depth if depth <= bound else outside] + [outside] * (columns - 1)
+                for i in range(start, end):
+                    row[i] = min(
+                        row[i - 1] + 1,
+                        prev_row[i] + 1,
+                        prev_row[i - 1] + (word[i - 1] != c),
+                        outside,
+                    )
+                lowest = min(row)
+                if lowest <= bound:
+                    heapq.heappush(queue, (lowest, pushed, child, prefix + c, row))
+                    pushed += 1
+        found.sort()
+        return found[:limit]
+
+    nearest._DOC_ERRORS = ["Levenshtein"]
+
+    def _search(self, node, word, nerrs):
         res = []
         # Terminate if we've run out of errors
         if nerrs < 0:
             return res
         # Precise match at the end of the word
         if nerrs == 0 and word == "":
-            if self._eos:
+            if self._eos[node]:
                 res.append("")
         # Precisely match word[0]
-        try:
-            subtrie = self[word[0]]
-            subres = subtrie.search(word[1:], nerrs)
-            for w in subres:
-                w2 = word[0] + w
-                if w2 not in res:
-                    res.append(w2)
-        except (IndexError, KeyError):
-            pass
-        # match with deletion of word[0]
-        try:
-            subres = self.search(word[1:], nerrs - 1)
-            for w in subres:
-                if w not in res:
-                    res.append(w)
-        except (IndexError,):
-            pass
-        # match with insertion before word[0]
-        try:
-            for k in self._keys:
-                subres = self[k].search(word, nerrs - 1)
-                for w in subres:
-                    w2 = k + w
+        if word:
+            child = self._child(node, word[0])
+            if child != -1:
+                for w in self._search(child, word[1:], nerrs):
+                    w2 = word[0] + w
                     if w2 not in res:
                         res.append(w2)
-        except (IndexError, KeyError):
-            pass
+        # match with deletion of word[0]
+        for w in self._search(node, word[1:], nerrs - 1):
+            if w not in res:
+                res.append(w)
+        # match with insertion before word[0]
+        for child in self._children(node):
+            k = chr(self._labels[child])
+            for w in self._search(child, word, nerrs - 1):
+                w2 = k + w
+                if w2 not in res:
+                    res.append(w2)
         # match on substitution of word[0]
-        try:
-            for k in self._keys:
-                subres = self[k].search(word[1:], nerrs - 1)
-                for w in subres:
-                    w2 = k + w
-                    if w2 not in res:
-                        res.append(w2)
-        except (IndexError, KeyError):
-            pass
+        for child in self._children(node):
+            k = chr(self._labels[child])
+            for w in self._search(child, word[1:], nerrs - 1):
+                w2 = k + w
+                if w2 not in res:
+                    res.append(w2)
         # All done!
         return res
 
-    search._DOC_ERRORS = ["nerrs"]
-
-    def __getitem__(self, key):
-        return self._keys[key]
-
-    def __setitem__(self, key, val):
-        self._keys[key] = val
+    def _child(self, node, c):
+        code = ord(c)
+        labels = self._labels
+        next_sibling = self._next_sibling
+        child = self._first_child[node]
+        while child != -1:
+            label = labels[child]
+            if label == code:
+                return child
+            if label > code:
+                break
+            child = next_sibling[child]
+        return -1
+
+    def _children(self, node):
+        child = self._first_child[node]
+        while child != -1:
+            yield child
+            child = self._next_sibling[child]
+
+    def _find(self, word):
+        node = 0
+        for c in word:
+            node = self._child(node, c)
+            if node == -1:
+                break
+        return node
+
+    def _add_child(self, node, code):
+        new = len(self._eos)
+        self._labels.append(code)
+        self._first_child.append(-1)
+        self._eos.append(0)
+        # Keep the siblings sorted
+        prev = -1
+        child = self._first_child[node]
+        while child != -1 and self._labels[child] < code:
+            prev = child
+            child = self._next_sibling[child]
+        self._next_sibling.append(child)
+        if prev == -1:
+            self._first_child[node] = new
+        else:
+            self._next_sibling[prev] = new
+        return new
 
     def __iter__(self):
-        if self._eos:
-            yield ""
-        for k in self._keys:
-            for w2 in self._keys[k]:
-                yield k + w2
+        # Depth first, so words come out in sorted order
+        stack = [(0, "")]
+        while stack:
+            (node, prefix) = stack.pop()
+            if self._eos[node]:
+                yield prefix
+            children = list(self._children(node))
+            for child in reversed(children):
+                stack.append((child, prefix + chr(self._labels[child])))
+
+
+class _Journal:
+    """Append-only log of the changes made to a word list file.
+
+    Each line holds an operation ("+" to add, "-" to remove) followed by
+    the word.  Added words are appended to the word list file itself, so
+    the journal mostly holds removals.  It is replayed after the file is
+    read, and folded back into the file by compaction.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.size = 0
+
+    def replay(self, trie):
+        """Apply the changes already on disk to the given trie."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename) as journal_f:
+            for ln in journal_f:
+                (op, word) = (ln[:1], ln[1:].strip())
+                if op == "+":
+                    trie.insert(word)
+                elif op == "-":
+                    trie.remove(word)
+                self.size += 1
+
+    def record(self, op, words):
+        """Append the given operation on each of the words to the journal."""
+        with open(self.filename, "a") as journal_f:
+            journal_f.write("".join("%s%s\n" % (op, word.strip()) for word in words))
+            journal_f.flush()
+            os.fsync(journal_f.fileno())
+        self.size += len(words)
+
+    def clear(self):
+        self.size = 0
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
 
 
 class PyPWL:
@@ -168,13 +321,16 @@ class PyPWL:
         This method takes as its only argument the name of a file
         containing the personal word list, one word per line.  Entries
         will be read from this file, and new entries will be written to
-        it automatically.
+        it automatically.  Removals are appended to a journal next to the
+        file, which is compacted back into it once a few dozen changes
+        have piled up, and when the word list is freed.
 
         If <pwl> is not specified or None, the list is maintained in
         memory only.
         """
         self.provider = None
         self._words = Trie()
+        self._journal = None
         if pwl is not None:
             self.pwl = os.path.abspath(pwl)
             self.tag = self.pwl
@@ -183,6 +339,9 @@ class PyPWL:
                 word = ln.strip()
                 self.add_to_session(word)
             pwl_f.close()
+            # Changes made since the file was last written are in the journal
+            self._journal = _Journal(self.pwl + ".journal")
+            self._journal.replay(self._words)
         else:
             self.pwl = None
             self.tag = "PyPWL"
@@ -193,8 +352,16 @@ class PyPWL:
         This method takes a word in the dictionary language and returns
         True if it is correctly spelled, and false otherwise.
         """
-        res = self._words.search(word)
-        return bool(res)
+        return word in self._words
+
+    def check_many(self, words):
+        """Check spelling of several words at once.
+
+        This method returns a list holding the indices of the given
+        words that are not correctly spelled, in increasing order.
+        """
+        trie = self._words
+        return [idx for (idx, word) in enumerate(words) if word not in trie]
 
     def suggest(self, word):
         """Suggest possible spellings for a word.
@@ -203,27 +370,41 @@ class PyPWL:
         word, returning the possibilities in a list.
         """
         limit = 10
-        maxdepth = 5
-        # Iterative deepening until we get enough matches
-        depth = 0
-        res = self._words.search(word, depth)
-        while len(res) < limit and depth < maxdepth:
-            depth += 1
-            for w in self._words.search(word, depth):
-                if w not in res:
-                    res.append(w)
-        # Limit number of suggs
-        return res[:limit]
+        maxdepth = 3
+        # Like Enchant, only the words with the fewest errors are offered.
+        # Allowing one more error at a time keeps the walk from visiting
+        # most of a large list when a close word exists.
+        for nerrs in range(maxdepth + 1):
+            found = self._words.nearest(word, nerrs, limit)
+            if found:
+                break
+        # Ties are in alphabetical order
+        return [w for (_, w) in found]
 
     def add(self, word):
         """Add a word to the user's personal dictionary.
         For a PWL, this means appending it to the file.
         """
-        if self.pwl is not None:
-            pwl_f = open(self.pwl, "a")
-            pwl_f.write("%s\n" % (word.strip(),))
-            pwl_f.close()
-        self.add_to_session(word)
+        self.add_many([word])
+
+    def add_many(self, words):
+        """Add several words to the user's personal dictionary.
+        This is the same as calling add() on each of the words, but
+        they are appended to the file all at once.
+        """
+        words = list(words)
+        for word in words:
+            self.add_to_session(word)
+        if self.pwl is not None and words:
+            with open(self.pwl, "a") as pwl_f:
+                pwl_f.write("".join("%s\n" % (word.strip(),) for word in words))
+                pwl_f.flush()
+                os.fsync(pwl_f.fileno())
+            # The journal is replayed after the file, so it must not
+            # undo an earlier removal of these words.
+            if self._journal.size:
+                self._journal.record("+", words)
+                self._maybe_compact()
 
     def add_to_pwl(self, word):
         """Add a word to the user's personal dictionary.
@@ -241,11 +422,31 @@ class PyPWL:
         # There's no exclude list for a stand-alone PWL.
         # Just remove it from the list.
         self._words.remove(word)
-        if self.pwl is not None:
-            pwl_f = open(self.pwl, "wt")
+        if self._journal is not None:
+            self._journal.record("-", [word])
+            self._maybe_compact()
+
+    def compact(self):
+        """Rewrite the word list file from memory and discard the journal.
+
+        The words are written in sorted order to a temporary file which
+        then replaces the word list file, so an interrupted compaction
+        leaves the previous file and journal intact.
+        """
+        if self._journal is None:
+            return
+        temp_filename = self.pwl + ".tmp"
+        with open(temp_filename, "wt") as pwl_f:
             for w in self._words:
                 pwl_f.write("%s\n" % (w.strip(),))
-            pwl_f.close()
+            pwl_f.flush()
+            os.fsync(pwl_f.fileno())
+        os.replace(temp_filename, self.pwl)
+        self._journal.clear()
+
+    def _maybe_compact(self):
+        if self._journal.size >= JOURNAL_COMPACT_THRESHOLD:
+            self.compact()
 
     def add_to_session(self, word):
         """Add a word to the session list."""
@@ -272,10 +473,12 @@ class PyPWL:
         """Check whether a word is in the personal exclude list."""
         return False
 
-    #  No-op methods to support internal use as a Dict() replacement
+    #  Methods to support internal use as a Dict() replacement
 
     def _check_this(self, msg):
         pass
 
     def _free(self):
-        pass
+        """Fold the pending changes into the word list file."""
+        if self._journal is not None and self._journal.size:
+            self.compact()
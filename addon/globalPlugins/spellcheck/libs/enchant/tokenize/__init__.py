@@ -225,9 +225,16 @@ def get_tokenizer(tag=None, chunkers=None, filters=None):
         chunkers = list(chunkers)
         for i in range(len(chunkers) - 1, -1, -1):
             tokenizer = wrap_tokenizer(chunkers[i], tokenizer)
-    if filters is not None:
-        for f in filters:
-            tokenizer = f(tokenizer)
+    filters = list(filters) if filters is not None else []
+    # Filters that only skip words matching a regex are fused, along with
+    # the language-specific rules, into a single layer.
+    if not filters:
+        return _FusedFilter(tokenizer, None, tk_func)
+    skip_pattern = _fuse_skip_patterns(filters)
+    if skip_pattern is not None:
+        return _FusedFilter(tokenizer, skip_pattern, tk_func)
+    for f in filters:
+        tokenizer = f(tokenizer)
     tokenizer = wrap_tokenizer(tokenizer, tk_func)
     return tokenizer
 
@@ -235,6 +242,33 @@ def get_tokenizer(tag=None, chunkers=None, filters=None):
 get_tokenizer._DOC_ERRORS = ["py", "py"]
 
 
+#  Matches backreferences, which would break once patterns are combined.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _fuse_skip_patterns(filters):
+    """Combine the patterns of the given filters into a single regex.
+
+    This is only possible if each filter is a plain Filter subclass that
+    skips the words matching its '_pattern' and doesn't split words.
+    Returns None if the filters can't be fused.
+    """
+    patterns = []
+    for f in filters:
+        if not (isinstance(f, type) and issubclass(f, Filter)):
+            return None
+        if f._pattern is None or any(
+            getattr(f, name) is not getattr(Filter, name)
+            for name in ("__init__", "__call__", "_skip", "_split")
+        ):
+            return None
+        patterns.append(f._pattern)
+    flags = {p.flags for p in patterns}
+    if len(flags) != 1 or any(_BACKREFERENCE.search(p.pattern) for p in patterns):
+        return None
+    return re.compile("|".join("(?:%s)" % p.pattern for p in patterns), flags.pop())
+
+
 class empty_tokenize(tokenize):  # noqa: N801
     """Tokenizer class that yields no elements."""
 
@@ -277,20 +311,32 @@ class basic_tokenize(tokenize):  # noqa: N801
     strip_from_start = '"' + "'`(["
     strip_from_end = '"' + "'`]).!,?;:"
 
+    #  Matches a run of non-whitespace, \s agrees with str.isspace().
+    _word_pattern = re.compile(r"\S+")
+
     def next(self):
         text = self._text
         offset = self._offset
         while True:
             if offset >= len(text):
                 break
-            # Find start of next word
-            while offset < len(text) and text[offset].isspace():
-                offset += 1
-            s_pos = offset
-            # Find end of word
-            while offset < len(text) and not text[offset].isspace():
-                offset += 1
-            e_pos = offset
+            if type(text) is str:
+                # Find both ends of the next word with a single search
+                match = self._word_pattern.search(text, offset)
+                if match is None:
+                    self._offset = len(text)
+                    break
+                (s_pos, e_pos) = match.span()
+                offset = e_pos
+            else:
+                # Find start of next word
+                while offset < len(text) and text[offset].isspace():
+                    offset += 1
+                s_pos = offset
+                # Find end of word
+                while offset < len(text) and not text[offset].isspace():
+                    offset += 1
+                e_pos = offset
             self._offset = offset
             # Strip chars from font/end of word
             while s_pos < len(text) and text[s_pos] in self.strip_from_start:
@@ -360,8 +406,15 @@ class Filter:
     should be skipped, and false otherwise.  The method _split(word) may
     be overridden as tokenization function that will be applied to further
     tokenize any words that aren't skipped.
+
+    Filters that only need to skip the words matching a regular expression
+    should instead set the '_pattern' attribute.  get_tokenizer() fuses
+    such filters into a single layer.
     """
 
+    #  Compiled regex matching the words to skip, if any.
+    _pattern = None
+
     def __init__(self, tokenizer):
         """Filter class constructor."""
         self._tokenizer = tokenizer
@@ -375,8 +428,11 @@ class Filter:
 
         If this method returns true, the given word will be skipped by
         the filter.  This should be overridden in subclasses to produce the
-        desired functionality.  The default behaviour is not to skip any words.
+        desired functionality.  The default behaviour is to skip the words
+        matching the '_pattern' attribute, if there is one.
         """
+        if self._pattern is not None and self._pattern.match(word):
+            return True
         return False
 
     def _split(self, word):
@@ -424,8 +480,9 @@ class Filter:
                     return (word, pos + self._curpos)
                 except StopIteration:
                     (word, pos) = next(self._tokenizer)
-                    while self._skip(self._to_string(word)):
-                        (word, pos) = next(self._tokenizer)
+                    if self._skip is not None:
+                        while self._skip(self._to_string(word)):
+                            (word, pos) = next(self._tokenizer)
                     self._curword = word
                     self._curpos = pos
                     self._curtok = self._split(word)
@@ -473,6 +530,36 @@ class Filter:
                 self._curpos = 0
 
 
+class _FusedFilter(Filter):
+    """Filter applying several regex filters and a tokenizer in one layer.
+
+    This is what get_tokenizer() builds in place of a chain of filters
+    that each skip the words matching their '_pattern', so that every
+    token goes through a single _TokenFilter and a single regex match.
+    When the text is split by basic_tokenize alone and the tokenizer has
+    a 'whole_text' method, unicode text is handed to it in one piece
+    instead of being split chunk by chunk.
+    """
+
+    def __init__(self, tokenizer, pattern, split):
+        super().__init__(tokenizer)
+        self._pattern = pattern
+        self._split = split
+        if pattern is None:
+            self._skip = None
+        # Tokenizers able to take the whole text at once, if no chunker is used
+        self._whole_text = None
+        if tokenizer is basic_tokenize:
+            self._whole_text = getattr(split, "whole_text", None)
+
+    def __call__(self, text):
+        if self._whole_text is not None:
+            tkn = self._whole_text(text, self._pattern)
+            if tkn is not None:
+                return tkn
+        return super().__call__(text)
+
+
 #  Pre-defined chunkers and filters start here
 
 
@@ -487,11 +574,6 @@ class URLFilter(Filter):
     _DOC_ERRORS = ["zA"]
     _pattern = re.compile(r"^[a-zA-Z]+:\/\/[^\s].*")
 
-    def _skip(self, word):
-        if self._pattern.match(word):
-            return True
-        return False
-
 
 class WikiWordFilter(Filter):
     r"""Filter skipping over WikiWords.
@@ -503,11 +585,6 @@ class WikiWordFilter(Filter):
     """
     _pattern = re.compile(r"^([A-Z]\w+[A-Z]+\w+)")
 
-    def _skip(self, word):
-        if self._pattern.match(word):
-            return True
-        return False
-
 
 class EmailFilter(Filter):
     r"""Filter skipping over email addresses.
@@ -515,14 +592,14 @@ class EmailFilter(Filter):
 
            ^.+@[^\.].*\.[a-z]{2,}$
 
-    That is, any words that resemble email addresses.
+    That is, any words that resemble email addresses.  The pattern actually
+    used is an equivalent one that settles on the first usable "@" (or on
+    one followed by a newline) instead of backtracking over every one, so
+    it runs in linear time.
     """
-    _pattern = re.compile(r"^.+@[^\.].*\.[a-z]{2,}$")
-
-    def _skip(self, word):
-        if self._pattern.match(word):
-            return True
-        return False
+    _pattern = re.compile(
+        r"^(?:[^\n](?:[^@\n]|@(?=\.))*@[^.][^\n]*|[^\n]+@\n[^\n]*)\.[a-z]{2,}$"
+    )
 
 
 class MentionFilter(Filter):
@@ -536,11 +613,6 @@ class MentionFilter(Filter):
     _DOC_ERRORS = ["zA"]
     _pattern = re.compile(r"(\A|\s)@(\w+)")
 
-    def _skip(self, word):
-        if self._pattern.match(word):
-            return True
-        return False
-
 
 class HashtagFilter(Filter):
     r"""Filter skipping over #hashtag.
@@ -553,11 +625,6 @@ class HashtagFilter(Filter):
     _DOC_ERRORS = ["zA"]
     _pattern = re.compile(r"(\A|\s)#(\w+)")
 
-    def _skip(self, word):
-        if self._pattern.match(word):
-            return True
-        return False
-
 
 class HTMLChunker(Chunker):
     """Chunker for breaking up HTML documents into chunks of checkable text.
@@ -36,11 +36,140 @@
 
 """
 
+import array
+import itertools
+import re
+import sys
+import threading
 import unicodedata
 
 import enchant.tokenize
 
 
+#  Whitespace separated chunks, and the whitespace between them, as split
+#  by basic_tokenize.  \s agrees with str.isspace().
+_CHUNK = re.compile(r"\S+")
+_WHITESPACE = re.compile(r"\s")
+
+#  Word patterns of the unicode fast path, keyed by their valid_chars.
+_WORD_PATTERNS = {}
+_WORD_PATTERNS_LOCK = threading.Lock()
+
+
+def _merge_ranges(ranges):
+    """Sort and merge inclusive (start, end) code point ranges."""
+    merged = []
+    for (start, end) in sorted(ranges):
+        if merged and merged[-1][1] >= start - 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _class_from_chars(chars):
+    """Build a regex matching exactly one of the given characters."""
+    return _class_from_ranges((c, c) for c in map(ord, chars))
+
+
+def _class_from_ranges(ranges):
+    """Build a regex matching one character of the given code point ranges."""
+    ranges = _merge_ranges(ranges)
+    # The re module only compiles classes of BMP characters into a lookup
+    # table, astral characters are matched by scanning the ranges one by one
+    bmp = "".join(
+        "\\U%08x-\\U%08x" % (start, min(end, 0xFFFF))
+        for (start, end) in ranges
+        if start <= 0xFFFF
+    )
+    astral = "".join(
+        "\\U%08x-\\U%08x" % (max(start, 0x10000), end)
+        for (start, end) in ranges
+        if end > 0xFFFF
+    )
+    if not astral:
+        return "[%s]" % bmp
+    if not bmp:
+        return "[%s]" % astral
+    return "(?:[%s]|(?=[\\U00010000-\\U0010ffff])[%s])" % (bmp, astral)
+
+
+def _build_char_classes():
+    """Build regexes matching str.isalpha() characters, and those or combining marks.
+
+    The re module has no notion of unicode categories, so the classes
+    are computed once from the running interpreter's unicode database.
+    Use prewarm() to pay for this ahead of the first tokenization.
+    """
+    # Decoding every code point at once is far quicker than joining chr() calls
+    codec = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+    every_char = array.array("I", range(sys.maxunicode + 1)).tobytes().decode(
+        codec, "surrogatepass"
+    )
+    alpha = []
+    # [^\W\d_] matches every alphabetic character, and a few numeric ones
+    for match in re.finditer(r"[^\W\d_]+", every_char):
+        if match.group().isalpha():
+            alpha.append((match.start(), match.end() - 1))
+        else:
+            alpha.extend(
+                (offset, offset)
+                for (offset, c) in enumerate(match.group(), match.start())
+                if c.isalpha()
+            )
+    # Combining marks only live in the first two planes and the variation selectors
+    candidates = itertools.chain(range(0x20000), range(0xE0000, 0xE1000))
+    marks = [
+        (c, c) for c in candidates if unicodedata.category(chr(c))[0] == "M"
+    ]
+    return _class_from_ranges(alpha), _class_from_ranges(alpha + marks)
+
+
+def prewarm(valid_chars=("'",)):
+    """Build the word pattern of the unicode fast path ahead of time.
+
+    The first tokenizer created for unicode text otherwise spends a
+    noticeable fraction of a second computing its character classes.
+    This is thread safe, so it can be called from a background thread.
+    """
+    _get_word_pattern(valid_chars)
+
+
+def _get_word_pattern(valid_chars):
+    """Get the compiled regex matching a single word of unicode text."""
+    key = tuple(valid_chars)
+    try:
+        return _WORD_PATTERNS[key]
+    except KeyError:
+        pass
+    with _WORD_PATTERNS_LOCK:
+        if key not in _WORD_PATTERNS:
+            if None not in _WORD_PATTERNS:
+                _WORD_PATTERNS[None] = _build_char_classes()
+            (alpha, letter) = _WORD_PATTERNS[None]
+            # A letter, then letters and the marks combining with them
+            pattern = "%s%s*" % (alpha, letter)
+            if valid_chars:
+                # Valid chars may only appear between letters
+                pattern += "(?:%s+(?=%s)%s*)*" % (
+                    _class_from_chars(valid_chars),
+                    alpha,
+                    letter,
+                )
+            _WORD_PATTERNS[key] = re.compile(pattern)
+    return _WORD_PATTERNS[key]
+
+
+def _as_str(text):
+    """Get a str with the same characters, at the same positions, as text."""
+    if isinstance(text, str):
+        return text
+    if isinstance(text, array.array) and text.itemsize == 4:
+        return text.tounicode()
+    # Keeps UTF-16 surrogates as separate characters, so positions still line up
+    return "".join(text)
+
+
 class tokenize(enchant.tokenize.tokenize):  # noqa: N801
     """Iterator splitting text into words, reporting position.
 
@@ -65,6 +194,8 @@ class tokenize(enchant.tokenize.tokenize):  # noqa: N801
         self._valid_chars = valid_chars
         self._text = text
         self._offset = 0
+        self._str = None
+        self._matches = None
         # Select proper implementation of self._consume_alpha.
         # 'text' isn't necessarily a string (it could be e.g. a mutable array)
         # so we can't use isinstance(text, str) to detect unicode.
@@ -81,6 +212,19 @@ class tokenize(enchant.tokenize.tokenize):  # noqa: N801
             else:
                 self._initialize_for_binary()
 
+    @staticmethod
+    def whole_text(text, skip_pattern=None):
+        """Tokenize unicode text the way a get_tokenizer() chain would.
+
+        This returns a tokenizer yielding the same words and offsets as
+        basic_tokenize followed by this tokenizer, skipping the chunks of
+        text that match <skip_pattern>, or None if the text isn't unicode.
+        """
+        tokenizer = _whole_text_tokenize(text, skip_pattern)
+        if tokenizer._matches is None:
+            return None
+        return tokenizer
+
     def _initialize_for_binary(self):
         self._consume_alpha = self._consume_alpha_b
         if self._valid_chars is None:
@@ -94,6 +238,10 @@ class tokenize(enchant.tokenize.tokenize):  # noqa: N801
             # Allow unicode typographic apostrophe
             # self._valid_chars = (u"'",u"\u2019")
             self._valid_chars = ("'",)
+        # Find words with a precompiled regex rather than character by character
+        self._word_pattern = _get_word_pattern(self._valid_chars)
+        self._str = _as_str(self._text)
+        self._matches = self._word_pattern.finditer(self._str)
 
     def _consume_alpha_b(self, text, offset):
         """Consume an alphabetic character from the given bytestring.
@@ -154,7 +302,23 @@ class tokenize(enchant.tokenize.tokenize):  # noqa: N801
                 incr += 1
         return incr
 
+    def set_offset(self, offset, replaced=False):
+        if self._str is not None:
+            # A mutable text may have been changed in place
+            if replaced:
+                self._str = _as_str(self._text)
+            self._matches = self._word_pattern.finditer(self._str, offset)
+        self._offset = offset
+
     def next(self):
+        matches = self._matches
+        if matches is not None:
+            for match in matches:
+                (start, end) = match.span()
+                self._offset = end
+                return (self._text[start:end], start)
+            self._offset = len(self._str)
+            raise StopIteration()
         text = self._text
         offset = self._offset
         while offset < len(text):
@@ -183,3 +347,80 @@ class tokenize(enchant.tokenize.tokenize):  # noqa: N801
                 return (text[cur_pos:offset], cur_pos)
         self._offset = offset
         raise StopIteration()
+
+    __next__ = next
+
+
+class _whole_text_tokenize(tokenize):  # noqa: N801
+    """Unicode fast path of the get_tokenizer() chains that only skip words.
+
+    Such a chain splits the text into whitespace separated chunks with
+    basic_tokenize, strips punctuation from their ends, skips the chunks
+    matching a pattern and tokenizes the rest with a new tokenize object
+    each.  The words of a chunk are exactly the words of the text found
+    within it, so this runs the word regex once over the whole text and
+    only looks for chunks to apply the skip pattern.  Like the chain,
+    'offset' reports the end of the chunk holding the last word, and
+    'set_offset' starts a new chunk at the given offset.
+    """
+
+    def __init__(self, text, skip_pattern=None):
+        super().__init__(text)
+        self._skip_pattern = skip_pattern
+        # The current chunk, as its end and whether it is skipped
+        self._chunk_end = 0
+        self._chunk_skipped = False
+        self._word_end = None
+
+    def set_offset(self, offset, replaced=False):
+        super().set_offset(offset, replaced)
+        self._chunk_end = offset
+        self._chunk_skipped = False
+        self._word_end = None
+
+    def _get_offset(self):
+        if self._word_end is None:
+            return self._offset
+        # Worked out on demand, since most callers never ask for it
+        match = _WHITESPACE.search(self._str, self._word_end)
+        if match is None:
+            return len(self._str)
+        return match.start()
+
+    offset = property(_get_offset, tokenize._set_offset)
+
+    def next(self):
+        skip_pattern = self._skip_pattern
+        for match in self._matches:
+            (start, end) = match.span()
+            if skip_pattern is not None:
+                if start >= self._chunk_end:
+                    self._find_chunk(start)
+                if self._chunk_skipped:
+                    continue
+            self._word_end = end
+            return (self._text[start:end], start)
+        self._word_end = None
+        # basic_tokenize leaves an offset past the end of the text alone
+        self._offset = max(self._offset, len(self._str))
+        raise StopIteration()
+
+    __next__ = next
+
+    def _find_chunk(self, pos):
+        """Find the chunk holding the given position and apply the skip pattern."""
+        text = self._str
+        # Chunks start at the end of the previous one, or where set_offset() put us
+        chunk = _CHUNK.search(text, self._chunk_end)
+        while chunk.end() <= pos:
+            chunk = _CHUNK.search(text, chunk.end())
+        (s_pos, e_pos) = chunk.span()
+        self._chunk_end = e_pos
+        # Strip chars from the start/end of the chunk, as basic_tokenize does
+        strip_from_start = enchant.tokenize.basic_tokenize.strip_from_start
+        strip_from_end = enchant.tokenize.basic_tokenize.strip_from_end
+        while s_pos < e_pos and text[s_pos] in strip_from_start:
+            s_pos += 1
+        while s_pos < e_pos and text[e_pos - 1] in strip_from_end:
+            e_pos -= 1
+        self._chunk_skipped = bool(self._skip_pattern.match(text[s_pos:e_pos]))
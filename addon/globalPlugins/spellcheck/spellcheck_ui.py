@@ -4,7 +4,9 @@
 # This file is covered by the GNU General Public License.
 
 import os
-import tones
+import time
+import threading
+import weakref
 import api
 import ui
 import controlTypes
@@ -12,7 +14,6 @@ import speech
 import queueHandler
 import eventHandler
 from enum import Enum, auto
-from contextlib import suppress
 from NVDAObjects import NVDAObject
 from NVDAObjects.behaviors import (
     EditableTextWithAutoSelectDetection,
@@ -22,11 +23,15 @@ from keyboardHandler import KeyboardInputGesture
 from scriptHandler import script
 from logHandler import log
 from .helpers import import_bundled_library, play_sound
+from .item_container import ItemContainerMixin
+from .language_dictionary import SUGGESTIONS_CACHE
 
 
 with import_bundled_library():
     from cached_property import cached_property
+    import enchant
     from enchant.checker import SpellChecker
+    from concurrent.futures import ThreadPoolExecutor
 
 
 # This should be set to Tru in the final release
@@ -34,6 +39,17 @@ with import_bundled_library():
 # Thereby avoiding any unintentional edits to the underlying text control
 CAPTURE_KEYS_WHILE_IN_FOCUS = True
 PASTE_GESTURE = KeyboardInputGesture.fromName("control+v")
+# Spellchecking jobs run one at a time, so a dictionary handle is never used by two jobs at once
+SPELLCHECK_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+# Suggestions for the focused misspelling and its neighbours are computed here ahead of time,
+# using dictionaries leased from enchant's pool rather than the handle shared with the menu
+SUGGESTIONS_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+# Hunspell handles are not thread safe, so every use of a dictionary goes through its lock
+_DICTIONARY_LOCKS = weakref.WeakKeyDictionary()
+# Number of words sent to the dictionary per call while checking
+SPELLCHECK_BATCH_SIZE = 128
+# How often (in seconds) newly found misspellings are handed to the menu while checking
+MISSPELLINGS_FLUSH_INTERVAL = 0.2
 
 
 import addonHandler
@@ -57,6 +73,31 @@ class UserChoiceType(Enum):
     ADD_TO_PERSONAL_DICTIONARY = auto()
 
 
+def get_dictionary_lock(language_dictionary):
+    return _DICTIONARY_LOCKS.setdefault(language_dictionary, threading.Lock())
+
+
+class LockedDictionary:
+    """
+    Passes the calls the spellchecker makes on to `language_dictionary`,
+    holding the dictionary lock for the duration of each call only.
+    Tokenizing the text between calls leaves the dictionary free for other threads.
+    """
+
+    def __init__(self, language_dictionary):
+        self.language_dictionary = language_dictionary
+        self.tag = language_dictionary.tag
+        self.lock = get_dictionary_lock(language_dictionary)
+
+    def check(self, word):
+        with self.lock:
+            return self.language_dictionary.check(word)
+
+    def check_many(self, words):
+        with self.lock:
+            return self.language_dictionary.check_many(words)
+
+
 class KeyboardNavigableNVDAObjectMixin:
     windowClassName = ""
     windowControlID = 0
@@ -74,70 +115,6 @@ class KeyboardNavigableNVDAObjectMixin:
         return script
 
 
-class ItemContainerMixin:
-    def __len__(self):
-        return len(self.items)
-
-    def __iter__(self):
-        return iter(self.items)
-
-    def index_of(self, item):
-        items_hashes = [hash(i) for i in self.items]
-        item_hash = hash(item)
-        if item_hash in items_hashes:
-            return items_hashes.index(item_hash)
-
-    def init_container_state(self, items, on_top_edge=None, on_bottom_edge=None):
-        self.items = items
-        self.children = items
-        self.controllerFor = self.children
-        self.on_top_edge = on_top_edge
-        self.on_bottom_edge = on_bottom_edge
-        self._current_index = 0
-
-    def set_current(self, index):
-        if index not in range(len(self)):
-            raise ValueError("Index out of range")
-        self._current_index = index
-
-    def get_item(self, index):
-        with suppress(IndexError):
-            return self.items[index]
-
-    def get_current_item(self):
-        return self.get_item(self._current_index)
-
-    def remove_item(self, item):
-        item_index = self.index_of(item)
-        self.items.pop(item_index)
-
-    def go_to_next(self):
-        item = self.get_item(self._current_index + 1)
-        if item is not None:
-            self._current_index += 1
-        elif self.items:
-            if self.on_bottom_edge is not None:
-                self.on_bottom_edge()
-                return
-            else:
-                item = self.items[-1]
-        return item
-
-    def go_to_prev(self):
-        prev_index = self._current_index - 1
-        if prev_index >= 0:
-            item = self.get_item(prev_index)
-            if item is not None:
-                self._current_index = prev_index
-        else:
-            if self.on_top_edge is not None:
-                self.on_top_edge()
-                return
-            elif len(self.items) > 0:
-                item = self.items[0]
-        return item
-
-
 class FakeEditableNVDAObject(
     KeyboardNavigableNVDAObjectMixin, EditableTextWithSuggestions, NVDAObject
 ):
@@ -161,11 +138,24 @@ class MenuItemObject(KeyboardNavigableNVDAObjectMixin, NVDAObject):
 
     @property
     def positionInfo(self):
+        if not self.parent.is_complete:
+            # The total is not known yet, see `event_gainFocus`
+            return {}
         return {
             "indexInGroup": self.parent.index_of(self) + 1,
             "similarItemsInGroup": len(self.parent),
         }
 
+    def event_gainFocus(self):
+        super().event_gainFocus()
+        if not self.parent.is_complete:
+            ui.message(
+                # translators: position of the focused item while the rest of the items are still being found
+                _("{index} of at least {count}").format(
+                    index=self.parent.index_of(self) + 1, count=len(self.parent)
+                )
+            )
+
     def go_to_next(self):
         item = self.parent.go_to_next()
         if item is not None:
@@ -182,16 +172,23 @@ class MenuItemObject(KeyboardNavigableNVDAObjectMixin, NVDAObject):
 
 
 class MisspellingMenuItemObject(MenuItemObject):
-    def __init__(self, lang_dict, *args, **kwargs):
+    def __init__(self, lang_dict, start, end, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.lang_dict = lang_dict
+        # The span of this misspelling in the checked text
+        self.start = start
+        self.end = end
         # Save this here
         self.original_misspelling = self.name
         self._user_choice = None
 
     @cached_property
     def suggestions(self):
-        return self.lang_dict.suggest(self.original_misspelling)
+        return self.parent.get_suggestions(self.original_misspelling)
+
+    def event_gainFocus(self):
+        super().event_gainFocus()
+        self.parent.prefetch_suggestions(self)
 
     def get_replacement_info(self):
         if self._user_choice is not None:
@@ -206,22 +203,30 @@ class MisspellingMenuItemObject(MenuItemObject):
             choice_value = None
         return (self.original_misspelling, choice_type, choice_value)
 
-    def on_user_choice(self, choice):
+    def on_user_choice(self, choice, apply_to_all=False):
+        if choice.choice_type is UserChoiceType.IGNORE_FOR_THIS_SESSION:
+            eventHandler.queueEvent("suggestionsClosed", FakeEditableNVDAObject())
+            self.parent.ignore_for_this_session(self)
+            return
+        if apply_to_all:
+            targets = self.parent.get_occurrences(self.original_misspelling)
+        else:
+            targets = (self,)
+        for item in targets:
+            item.set_user_choice(choice)
+        self.back_to_misspelling()
+
+    def set_user_choice(self, choice):
         self._user_choice = choice
         if choice.choice_type is UserChoiceType.SUGGESTION:
             # translators: appears between the misspelled word and the selected suggestion by the user.
             desc = _("accepted: {suggestion}").format(suggestion=choice.name)
-        elif choice.choice_type is UserChoiceType.IGNORE_FOR_THIS_SESSION:
-            eventHandler.queueEvent("suggestionsClosed", FakeEditableNVDAObject())
-            self.parent.ignore_for_this_session(self)
-            return
         elif choice.choice_type is UserChoiceType.ADD_TO_PERSONAL_DICTIONARY:
             # translators: appears in the misspelled words menu when a user chooses to add the erroneous word to the personal dictionary.
             desc = _("Added to personal dictionary")
         else:
             desc = self.description
         self.description = desc
-        self.back_to_misspelling()
 
     def back_to_misspelling(self):
         eventHandler.queueEvent("suggestionsClosed", FakeEditableNVDAObject())
@@ -341,6 +346,17 @@ class SuggestionMenuItemObject(MenuItemObject):
     def script_accept_suggestion(self, gesture):
         self.acceptance_callback(self)
 
+    @script(
+        gesture="kb:shift+enter",
+        # translators: appears in the NVDA input help.
+        description=_(
+            "Applies the chosen suggestion to every occurrence of the misspelled word"
+        ),
+        category=SCRCAT__SPELLCHECK,
+    )
+    def script_accept_suggestion_for_all(self, gesture):
+        self.acceptance_callback(self, apply_to_all=True)
+
 
 class MenuObject(KeyboardNavigableNVDAObjectMixin, ItemContainerMixin, NVDAObject):
     role = controlTypes.ROLE_MENU
@@ -372,58 +388,151 @@ class SpellCheckMenu(MenuObject):
         super().__init__(*args, **kwargs)
         self.language_dictionary = language_dictionary
         self.text_to_process = text_to_process
+        # Guards the dictionary handle, which is shared with background workers
+        self.dictionary_lock = get_dictionary_lock(language_dictionary)
+        # Words whose suggestions are still worth computing in the background
+        self._prefetch_words = frozenset()
+        # The menu is filled in as misspellings are found
+        self.init_container_state(items=[])
+        self.is_complete = False
+        # Words ignored in this session
+        self._ignored_words = set()
+        # Maps each misspelled word to the menu items of its occurrences
+        self._occurrences = {}
+
+    def iter_misspellings(self, cancelled=None):
+        """
+        Runs the spellchecker over the text and yields a `(word, start, end)` tuple
+        for each misspelling as soon as it is found.
+        This is meant to be consumed from a background thread.
+        Checking stops early once the optional `cancelled` callable returns True.
+        """
         spellchecker = self.make_spellchecker(
-            self.language_dictionary, self.text_to_process
+            self.language_dictionary, self.text_to_process, cancelled
         )
-        misspelling_menu_items = [
-            MisspellingMenuItemObject(
-                parent=self, name=item.word, lang_dict=spellchecker.dict
+        for item in spellchecker:
+            # The checker works on the text itself, so offsets index into `text_to_process`
+            yield (item.word, item.wordpos, item.wordpos + len(item.word))
+
+    def add_misspellings(self, misspellings):
+        new_items = []
+        for (word, start, end) in misspellings:
+            if word in self._ignored_words:
+                continue
+            item = MisspellingMenuItemObject(
+                parent=self,
+                name=word,
+                lang_dict=self.language_dictionary,
+                start=start,
+                end=end,
             )
-            for item in spellchecker
-        ]
-        self.init_container_state(
-            # Here we consume our SpellChecker for the first time
-            # If you did a for-loop after this line, you'll get nothing
-            items=misspelling_menu_items
+            self._occurrences.setdefault(word, []).append(item)
+            new_items.append(item)
+        self.add_items(new_items)
+
+    def get_occurrences(self, word):
+        """Return the menu items for every occurrence of the given misspelling."""
+        return self._occurrences.get(word, ())
+
+    def mark_complete(self):
+        self.is_complete = True
+
+    def get_suggestions(self, word):
+        lang_tag = self.language_dictionary.tag
+        suggestions = SUGGESTIONS_CACHE.get(lang_tag, word)
+        if suggestions is None:
+            with self.dictionary_lock:
+                # A background worker may have got these while we were waiting
+                suggestions = SUGGESTIONS_CACHE.get(lang_tag, word)
+                if suggestions is None:
+                    suggestions = self.language_dictionary.suggest(word)
+                    SUGGESTIONS_CACHE.put(lang_tag, word, suggestions)
+        return suggestions
+
+    def prefetch_suggestions(self, item):
+        """Compute the suggestions for the given item and its neighbours in the background."""
+        index = self.index_of(item)
+        if index is None:
+            return
+        neighbours = (self.get_item(i) for i in range(max(index - 1, 0), index + 2))
+        self._prefetch_words = frozenset(
+            neighbour.original_misspelling
+            for neighbour in neighbours
+            if neighbour is not None
+        )
+        lang_tag = self.language_dictionary.tag
+        for word in self._prefetch_words:
+            if (lang_tag, word) not in SUGGESTIONS_CACHE:
+                SUGGESTIONS_PREFETCH_EXECUTOR.submit(self._prefetch_suggestions, word)
+
+    def _prefetch_suggestions(self, word):
+        # The user has moved on since this was requested
+        if word not in self._prefetch_words:
+            return
+        try:
+            if isinstance(self.language_dictionary, enchant.Dict):
+                self._prefetch_pooled_suggestions(word)
+            else:
+                # Compiled dictionaries are not pooled, and don't release the GIL anyway
+                self.get_suggestions(word)
+        except Exception:
+            log.exception(f"Failed to get suggestions for word {word}")
+
+    def _prefetch_pooled_suggestions(self, word):
+        # Hunspell suggestions are slow, so they are computed on a separate handle,
+        # and neither the menu nor the spellchecking job wait for them
+        lang_tag = self.language_dictionary.tag
+        generation = SUGGESTIONS_CACHE.generation(lang_tag)
+        if SUGGESTIONS_CACHE.get(lang_tag, word) is not None:
+            return
+        with enchant.lease_dict(lang_tag) as dictionary:
+            suggestions = dictionary.suggest(word)
+        # Words added to the personal dictionary in the meantime invalidate these
+        SUGGESTIONS_CACHE.put(lang_tag, word, suggestions, generation)
+
+    def make_spellchecker(self, language_dictionary, text, cancelled=None):
+        # The dictionary is only locked while it checks a batch of words
+        spellchecker = SpellChecker(
+            LockedDictionary(language_dictionary),
+            batch_size=SPELLCHECK_BATCH_SIZE,
+            spans=True,
+            cancelled=cancelled,
         )
-        # A list of ignored words in this session
-        self._ignored_words = []
-
-    def make_spellchecker(self, language_dictionary, text):
-        spellchecker = SpellChecker(language_dictionary)
         spellchecker.set_text(text)
         return spellchecker
 
     def get_corrected_text(self):
-        # We should reinitialize the spellChecker class with the same text we used to initialize it in the first place
-        spellchecker = self.make_spellchecker(
-            self.language_dictionary, self.text_to_process
-        )
-        for ignored_word in self._ignored_words:
-            spellchecker.ignore_always(ignored_word)
-        replacement_info = [misspelling.get_replacement_info() for misspelling in self]
-        for (chk, replacement_info) in zip(spellchecker, replacement_info):
-            misspelling, choice_type, choice_value = replacement_info
-            # Sanity check. Remove
-            if chk.word != misspelling:
-                tones.beep(400, 400)
+        # Splice the accepted suggestions into the text using the spans
+        # recorded while checking, so no word goes through the dictionary again
+        text = self.text_to_process
+        corrected_chunks = []
+        last_end = 0
+        words_to_add = set()
+        replacements = set()
+        for misspelling in self:
+            word, choice_type, choice_value = misspelling.get_replacement_info()
             if choice_type is UserChoiceType.SUGGESTION:
-                chk.replace(choice_value)
+                corrected_chunks.append(text[last_end : misspelling.start])
+                corrected_chunks.append(choice_value)
+                last_end = misspelling.end
+                replacements.add((word, choice_value))
             elif choice_type is UserChoiceType.ADD_TO_PERSONAL_DICTIONARY:
-                chk.add()
-        return spellchecker.get_text()
+                words_to_add.add(word)
+        corrected_chunks.append(text[last_end:])
+        with self.dictionary_lock:
+            for word in words_to_add:
+                self.language_dictionary.add(word)
+            for (word, replacement) in replacements:
+                self.language_dictionary.store_replacement(word, replacement)
+        if words_to_add:
+            # Added words may now show up as suggestions
+            SUGGESTIONS_CACHE.invalidate(self.language_dictionary.tag)
+        return "".join(corrected_chunks)
 
     def ignore_for_this_session(self, item):
         misspelling = item.original_misspelling
-        self._ignored_words.append(misspelling)
-        current_focus_index = self.index_of(item)
-        items_to_remove = [
-            menu_item
-            for menu_item in self
-            if menu_item.original_misspelling == misspelling
-        ]
-        for rmv_item in items_to_remove:
-            self.remove_item(rmv_item)
+        self._ignored_words.add(misspelling)
+        self.remove_items(self._occurrences.pop(misspelling, ()))
         if self:
             self.set_current(0)
             eventHandler.queueEvent("gainFocus", self)
@@ -481,3 +590,78 @@ class SpellCheckMenu(MenuObject):
                     queueHandler.eventQueue, api.copyToClip, old_clipboard_text
                 )
 
+
+class SpellCheckJob:
+    """
+    Finds the misspellings of a SpellCheckMenu on a background thread.
+    Misspellings are added to the menu on NVDA's main thread as they are found.
+    `on_first_misspelling` is called as soon as the menu has an item, and `on_finished`
+    when the whole text has been checked, unless the job has been cancelled in the meantime.
+    If checking fails, `on_finished` gets the exception as well, and the menu is left incomplete.
+    """
+
+    def __init__(self, menu, on_first_misspelling, on_finished):
+        self.menu = menu
+        self.on_first_misspelling = on_first_misspelling
+        self.on_finished = on_finished
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        SPELLCHECK_JOB_EXECUTOR.submit(self._run).add_done_callback(
+            self._done_callback
+        )
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self):
+        pending = []
+        # Flush the first misspelling right away so the menu opens immediately
+        last_flush = 0
+        # Cancellation is also checked by the spellchecker before each batch of words,
+        # so an abandoned job stops soon even if the text has few misspellings
+        misspellings = self.menu.iter_misspellings(cancelled=self._cancelled.is_set)
+        for misspelling in misspellings:
+            if self.cancelled:
+                return
+            pending.append(misspelling)
+            if (time.monotonic() - last_flush) >= MISSPELLINGS_FLUSH_INTERVAL:
+                self._queue(self._add_misspellings, pending)
+                pending = []
+                last_flush = time.monotonic()
+        if pending:
+            self._queue(self._add_misspellings, pending)
+
+    def _queue(self, func, *args):
+        queueHandler.queueFunction(queueHandler.eventQueue, func, *args)
+
+    def _done_callback(self, future):
+        if self.cancelled:
+            return
+        try:
+            future.result()
+        except Exception as e:
+            log.exception("Failed to spellcheck the selected text")
+            self._queue(self._finish, e)
+            return
+        self._queue(self._finish)
+
+    def _add_misspellings(self, misspellings):
+        # The job may have been cancelled while this call was waiting in the queue
+        if self.cancelled:
+            return
+        had_items = bool(self.menu.items)
+        self.menu.add_misspellings(misspellings)
+        if not had_items and self.menu.items:
+            self.on_first_misspelling(self.menu)
+
+    def _finish(self, exception=None):
+        if self.cancelled:
+            return
+        if exception is None:
+            self.menu.mark_complete()
+        self.on_finished(self.menu, exception)
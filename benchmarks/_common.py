@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+import time
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBS_DIRECTORY = os.path.join(
+    REPO_DIRECTORY, "addon", "globalPlugins", "spellcheck", "libs"
+)
+
+
+def make_argument_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--libs",
+        default=LIBS_DIRECTORY,
+        help="the bundled libraries to benchmark, e.g. from an older checkout",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per measurement, the best is kept"
+    )
+    return parser
+
+
+def use_libs(libs_directory):
+    """Import the bundled libraries from the given directory."""
+    sys.path.insert(0, libs_directory)
+    # The pure-python parts of enchant work without the C library
+    os.environ.setdefault("PYENCHANT_IGNORE_MISSING_LIB", "1")
+
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,69 @@
+"""
+Compare check_parallel() on worker threads with a single SpellChecker
+going over the same text, for 1 to 8 workers.
+
+This needs the enchant C library and a dictionary for --lang.
+"""
+
+import os
+import random
+
+from _common import best_time, make_argument_parser, use_libs
+
+
+COMMON_WORDS = (
+    "the of and to in is that it was for on are with as his they be at one "
+    "have this from or had by word but what some we can out other were all "
+    "there when up use your how said an each she which do their time if will"
+).split()
+MISSPELLED_WORDS = ["helo", "wrold", "teh", "recieve", "seperate"]
+
+
+def make_text(size=4 << 20):
+    """Make text of common words, with about 3% misspellings."""
+    rng = random.Random(1)
+    chunks = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.03:
+            word = rng.choice(MISSPELLED_WORDS)
+        else:
+            word = rng.choice(COMMON_WORDS)
+        chunks.append(word + ("\n" if rng.random() < 0.05 else " "))
+        length += len(chunks[-1])
+    return "".join(chunks)[:size]
+
+
+def main():
+    parser = make_argument_parser(__doc__)
+    parser.add_argument("--lang", default="en_US")
+    args = parser.parse_args()
+    use_libs(args.libs)
+    import enchant
+    from enchant.checker import SpellChecker, check_parallel
+
+    dictionary = enchant.Dict(args.lang)
+    text = make_text()
+
+    def check_serially():
+        checker = SpellChecker(dictionary, batch_size=128, spans=True)
+        checker.set_text(text)
+        return [(err.word, err.wordpos) for err in checker]
+
+    def factory(broker):
+        return broker.request_dict(args.lang)
+
+    expected = check_serially()
+    print(f"text: {len(text)} characters, {len(expected)} misspellings, {os.cpu_count()} CPUs")
+    serial = best_time(check_serially, args.repeat)
+    print(f"SpellChecker:               {serial:.3f} s")
+    for workers in (1, 2, 4, 8):
+        assert check_parallel(factory, text, workers=workers) == expected
+        elapsed = best_time(
+            lambda: check_parallel(factory, text, workers=workers), args.repeat
+        )
+        print(f"check_parallel, {workers} threads: {elapsed:.3f} s ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
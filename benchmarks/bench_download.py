@@ -0,0 +1,194 @@
+"""
+Compare the ways of downloading a dictionary against a local stand-in
+for GitHub, which adds a delay to each new connection and each request,
+and limits the bandwidth of each connection:
+
+- serial: a new client for each file, one file after the other, which
+  is how dictionaries were downloaded before
+- concurrent: one pooled client, with the files fetched concurrently on
+  4 threads, like language_dictionary._download_files
+
+Pass .dic files to serve, their .aff files must be next to them. Without
+any, random files of the sizes of a few LibreOffice dictionaries are used.
+"""
+
+# Imported before the bundled libraries, which include an asyncio for NVDA's
+# Python that httpx would otherwise pick up instead of this Python's own
+import asyncio  # noqa: F401
+import http.server
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import best_time, make_argument_parser, use_libs
+
+
+# (.dic size, .aff size) in bytes
+DICTIONARY_SIZES = {
+    "en_US": (551260, 3090),
+    "es_ES": (702341, 167135),
+    "de_DE": (4356845, 18989),
+}
+CHUNK_SIZE = 16 * 1024
+
+
+class StandInServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, files, connect_latency, latency, bandwidth):
+        super().__init__(("127.0.0.1", 0), StandInRequestHandler)
+        self.files = files
+        self.connect_latency = connect_latency
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.connections = 0
+
+    @property
+    def base_url(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+
+class StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+    # Keep connections open, so pooled clients can reuse them
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Stands in for the TCP and TLS handshakes
+        self.server.connections += 1
+        time.sleep(self.server.connect_latency)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        (lang_tag, name) = self.path.strip("/").split("/")
+        if name == "listing.json":
+            data = json.dumps(
+                [
+                    {"name": filename, "download_url": None, "size": len(contents)}
+                    for (filename, contents) in self.server.files[lang_tag].items()
+                ]
+            ).encode("utf-8")
+        else:
+            data = self.server.files[lang_tag][name]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        for start in range(0, len(data), CHUNK_SIZE):
+            self.wfile.write(data[start : start + CHUNK_SIZE])
+            time.sleep(CHUNK_SIZE / self.server.bandwidth)
+
+
+def load_files(dic_filenames):
+    files = {}
+    for dic_filename in dic_filenames:
+        (tag, _) = os.path.splitext(os.path.basename(dic_filename))
+        files[tag] = {}
+        for filename in (dic_filename, os.path.splitext(dic_filename)[0] + ".aff"):
+            with open(filename, "rb") as f:
+                files[tag][os.path.basename(filename)] = f.read()
+    return files
+
+
+def make_files():
+    return {
+        tag: {f"{tag}.dic": os.urandom(dic_size), f"{tag}.aff": os.urandom(aff_size)}
+        for (tag, (dic_size, aff_size)) in DICTIONARY_SIZES.items()
+    }
+
+
+def get_listing(client, base_url, lang_tag):
+    response = client.get(f"{base_url}/{lang_tag}/listing.json")
+    response.raise_for_status()
+    return [
+        (entry["name"], f"{base_url}/{lang_tag}/{entry['name']}", entry["size"])
+        for entry in response.json()
+    ]
+
+
+def fetch(client, url, size, destination):
+    with client.stream("GET", url) as response, open(destination, "wb") as output_file:
+        for data in response.iter_bytes():
+            output_file.write(data)
+    assert os.path.getsize(destination) == size
+
+
+def download_serially(base_url, lang_tag, directory):
+    import httpx
+
+    for (name, url, size) in get_listing(httpx, base_url, lang_tag):
+        with httpx.Client() as client:
+            fetch(client, url, size, os.path.join(directory, name))
+
+
+def download_concurrently(base_url, lang_tag, directory, executor):
+    import httpx
+
+    with httpx.Client() as client:
+        futures = [
+            executor.submit(fetch, client, url, size, os.path.join(directory, name))
+            for (name, url, size) in get_listing(client, base_url, lang_tag)
+        ]
+        for future in futures:
+            future.result()
+
+
+def main():
+    parser = make_argument_parser(__doc__)
+    parser.add_argument("dictionaries", nargs="*", help="the .dic files to serve")
+    parser.add_argument(
+        "--connect-latency", type=float, default=0.15, help="seconds to open a connection"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="seconds before each response"
+    )
+    parser.add_argument(
+        "--bandwidth", type=int, default=2048, help="KiB per second for each connection"
+    )
+    args = parser.parse_args()
+    use_libs(args.libs)
+    files = load_files(args.dictionaries) if args.dictionaries else make_files()
+    server = StandInServer(
+        files, args.connect_latency, args.latency, args.bandwidth * 1024
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(
+        f"connect latency {args.connect_latency * 1000:.0f} ms, "
+        f"latency {args.latency * 1000:.0f} ms, {args.bandwidth} KiB/s per connection"
+    )
+    with tempfile.TemporaryDirectory() as directory, ThreadPoolExecutor(
+        max_workers=4
+    ) as executor:
+        for (lang_tag, lang_files) in files.items():
+            sizes = ", ".join(
+                f"{name} {len(contents) >> 10} KiB" for (name, contents) in lang_files.items()
+            )
+            server.connections = 0
+            serial = best_time(
+                lambda: download_serially(server.base_url, lang_tag, directory), args.repeat
+            )
+            serial_connections = server.connections // args.repeat
+            server.connections = 0
+            concurrent = best_time(
+                lambda: download_concurrently(
+                    server.base_url, lang_tag, directory, executor
+                ),
+                args.repeat,
+            )
+            concurrent_connections = server.connections // args.repeat
+            print(
+                f"{lang_tag} ({sizes}): serial {serial:.3f} s "
+                f"({serial_connections} connections), concurrent {concurrent:.3f} s "
+                f"({concurrent_connections} connections, {serial / concurrent:.2f}x)"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
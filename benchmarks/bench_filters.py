@@ -0,0 +1,89 @@
+"""
+Measure what the bundled filters add to get_tokenizer('en_US'):
+
+- the time per token with no filters and with all five of them
+- how many Python frames deep tokenizing goes, which grows with each
+  layer a filter or the language splitter wraps around the tokenizer
+- the time EmailFilter takes on a long token with many "@" characters,
+  which a backtracking pattern takes quadratic time on
+
+Run it against an older checkout with --libs to get a baseline.
+"""
+
+import random
+import sys
+
+from _common import best_time, make_argument_parser, use_libs
+
+WORDS = (
+    "the quick brown fox don't jump über naïve café résumé hello, world! it's "
+    "https://example.com/a?b=c john.doe@example.org @someone #topic WikiWord"
+).split()
+
+
+def make_text(size=1 << 20):
+    rng = random.Random(1)
+    return " ".join(rng.choice(WORDS) for _ in range(size // 6))[:size]
+
+
+def depth_of(frame):
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def stack_depth(tokenizer, text):
+    """Return the deepest a call goes below the caller while tokenizing."""
+    base = depth_of(sys._getframe())
+    deepest = 0
+
+    def profile(frame, event, arg):
+        nonlocal deepest
+        if event == "call":
+            deepest = max(deepest, depth_of(frame) - base)
+
+    sys.setprofile(profile)
+    try:
+        for _ in tokenizer(text):
+            pass
+    finally:
+        sys.setprofile(None)
+    return deepest
+
+
+def main():
+    args = make_argument_parser(__doc__).parse_args()
+    use_libs(args.libs)
+    from enchant.tokenize import (
+        EmailFilter,
+        HashtagFilter,
+        MentionFilter,
+        URLFilter,
+        WikiWordFilter,
+        get_tokenizer,
+    )
+
+    filters = [URLFilter, EmailFilter, WikiWordFilter, MentionFilter, HashtagFilter]
+    text = make_text()
+    plain = get_tokenizer("en_US")
+    filtered = get_tokenizer("en_US", filters=filters)
+    token_count = len(list(plain(text)))
+    print(f"text: {len(text)} characters, {token_count} tokens")
+    for (name, tokenizer) in (("no filters", plain), ("5 filters", filtered)):
+        elapsed = best_time(lambda: list(tokenizer(text)), args.repeat)
+        depth = stack_depth(tokenizer, "hello world")
+        print(
+            f"{name}: {elapsed / token_count * 1e6:.2f} us per token, "
+            f"{depth} frames deep"
+        )
+    email_filter = get_tokenizer("en_US", filters=[EmailFilter])
+    for count in (7500, 30000):
+        long_token = "a@" * count + "."
+        elapsed = best_time(lambda: list(email_filter(long_token)), args.repeat)
+        print(f"EmailFilter on a {len(long_token)} character token: {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
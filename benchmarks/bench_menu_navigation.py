@@ -0,0 +1,139 @@
+"""
+Measure the misspellings menu's bookkeeping for large numbers of items:
+
+- fill: adding the items in batches, as misspellings are found
+- navigate: moving through every item and looking up its position, as
+  happens on each focus change
+- ignore: removing every occurrence of a few words, as "ignore for this
+  session" does
+
+Three ways of keeping positions are compared:
+
+- index: looking each item up with list.index, as the add-on first did
+- rebuild: a map of item positions rebuilt after every change
+- incremental: ItemContainerMixin, which only updates the positions
+  that moved
+"""
+
+import importlib.util
+import os
+import random
+from functools import partial
+
+from _common import REPO_DIRECTORY, best_time, make_argument_parser
+
+
+ITEM_CONTAINER_FILENAME = os.path.join(
+    REPO_DIRECTORY, "addon", "globalPlugins", "spellcheck", "item_container.py"
+)
+# Misspellings are handed to the menu in batches of about this size
+BATCH_SIZE = 64
+# Distinct misspelled words, each occurring many times
+WORD_COUNT = 500
+IGNORED_WORDS = 5
+# Navigating with list.index is quadratic, beyond this it would take minutes
+MAX_INDEX_NAVIGATION_ITEMS = 20000
+
+
+def load_item_container(filename):
+    # The add-on's package needs NVDA, this module doesn't
+    spec = importlib.util.spec_from_file_location("item_container", filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ItemContainerMixin
+
+
+def make_container_classes(ItemContainerMixin):
+    class Incremental(ItemContainerMixin):
+        pass
+
+    class Rebuild(ItemContainerMixin):
+        def _update_positions(self, start=0):
+            self._positions = {id(item): index for (index, item) in enumerate(self.items)}
+
+    class Index(ItemContainerMixin):
+        def index_of(self, item):
+            try:
+                return self.items.index(item)
+            except ValueError:
+                return None
+
+        def _update_positions(self, start=0):
+            pass
+
+        def remove_items(self, items):
+            ids_to_remove = {id(item) for item in items}
+            self.items[:] = [item for item in self.items if id(item) not in ids_to_remove]
+
+    return {"index": Index, "rebuild": Rebuild, "incremental": Incremental}
+
+
+class Item:
+    __slots__ = ("word",)
+
+    def __init__(self, word):
+        self.word = word
+
+
+def make_items(count):
+    rng = random.Random(1)
+    return [Item("word%d" % rng.randrange(WORD_COUNT)) for _ in range(count)]
+
+
+def fill(container_class, items):
+    container = container_class()
+    container.init_container_state(items=[])
+    for start in range(0, len(items), BATCH_SIZE):
+        container.add_items(items[start : start + BATCH_SIZE])
+    return container
+
+
+def navigate(container):
+    container.set_current(0)
+    item = container.get_current_item()
+    for _ in range(len(container)):
+        assert container.index_of(item) is not None
+        item = container.go_to_next()
+
+
+def ignore(container, items):
+    occurrences = {}
+    for item in items:
+        occurrences.setdefault(item.word, []).append(item)
+    for word in ["word%d" % i for i in range(IGNORED_WORDS)]:
+        container.remove_items(occurrences.get(word, ()))
+
+
+def main():
+    parser = make_argument_parser(__doc__)
+    parser.add_argument(
+        "--items",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="numbers of menu items to measure",
+    )
+    args = parser.parse_args()
+    container_classes = make_container_classes(load_item_container(ITEM_CONTAINER_FILENAME))
+    for count in args.items:
+        items = make_items(count)
+        for (name, container_class) in container_classes.items():
+            fill_time = best_time(lambda: fill(container_class, items), args.repeat)
+            container = fill(container_class, items)
+            if name == "index" and count > MAX_INDEX_NAVIGATION_ITEMS:
+                navigate_result = "skipped"
+            else:
+                navigate_time = best_time(lambda: navigate(container), args.repeat)
+                navigate_result = f"{navigate_time * 1000:.1f} ms"
+            ignore_time = min(
+                best_time(partial(ignore, fill(container_class, items), items), 1)
+                for _ in range(args.repeat)
+            )
+            print(
+                f"{count} items, {name}: fill {fill_time * 1000:.1f} ms, "
+                f"navigate {navigate_result}, ignore {ignore_time * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measure a personal word list of 100k words held by PyPWL: how long it
+takes to load from its file and how much memory it then takes, and
+how fast it checks words it holds and words it doesn't, and how fast it
+suggests spellings for words it doesn't hold.
+
+With --lang, it also times DictWithPWL.check on those words, with the
+list as its in-memory personal word list. This needs the enchant C
+library and a dictionary for the language.
+
+Run it against an older checkout with --libs to get a baseline.
+"""
+
+import os
+import random
+import tempfile
+import tracemalloc
+
+from _common import best_time, make_argument_parser, use_libs
+
+
+LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+# Makes the made up words share prefixes about as much as real ones do
+LETTER_WEIGHTS = [26 - i for i in range(len(LETTERS))]
+
+
+def make_words(count, rng):
+    words = set()
+    while len(words) < count:
+        length = rng.randint(4, 12)
+        words.add("".join(rng.choices(LETTERS, LETTER_WEIGHTS, k=length)))
+    return sorted(words)
+
+
+def read_words(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return sorted({ln.strip() for ln in f if ln.strip()})
+
+
+def main():
+    parser = make_argument_parser(__doc__)
+    parser.add_argument("--count", type=int, default=100000, help="words in the list")
+    parser.add_argument(
+        "--words", help="a file with one word per line to use instead of made up words"
+    )
+    parser.add_argument(
+        "--suggestions", type=int, default=20, help="words to suggest spellings for"
+    )
+    parser.add_argument("--lang", help="the language of the DictWithPWL to time")
+    args = parser.parse_args()
+    use_libs(args.libs)
+    from enchant.pypwl import PyPWL
+
+    rng = random.Random(1)
+    words = read_words(args.words) if args.words else make_words(args.count, rng)
+    # Words that are not in the list differ from one that is by a letter
+    word_set = set(words)
+    absent = []
+    for word in rng.sample(words, min(len(words), 10000)):
+        position = rng.randrange(len(word))
+        candidate = word[:position] + rng.choice(LETTERS) + word[position + 1 :]
+        if candidate not in word_set:
+            absent.append(candidate)
+    present = rng.sample(words, min(len(words), 10000))
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "words.dic")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("".join(word + "\n" for word in words))
+        load_time = best_time(lambda: PyPWL(filename), args.repeat)
+        tracemalloc.start()
+        pwl = PyPWL(filename)
+        (memory, _) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert all(pwl.check(word) for word in present)
+    assert not any(pwl.check(word) for word in absent)
+    present_time = best_time(lambda: [pwl.check(word) for word in present], args.repeat)
+    absent_time = best_time(lambda: [pwl.check(word) for word in absent], args.repeat)
+    characters = sum(len(word) for word in words)
+    print(f"{len(words)} words, {characters} characters")
+    print(f"load:  {load_time:.3f} s, {memory / 2**20:.1f} MiB ({memory / characters:.1f} bytes per character)")
+    print(f"check: {present_time / len(present) * 1e6:.2f} us per word in the list")
+    print(f"check: {absent_time / len(absent) * 1e6:.2f} us per word not in the list")
+    if args.lang:
+        import enchant
+
+        dictionary = enchant.DictWithPWL(args.lang)
+        for word in words:
+            dictionary.pwl.add(word)
+        tokens = present + absent
+        rng.shuffle(tokens)
+        check_time = best_time(lambda: [dictionary.check(word) for word in tokens], args.repeat)
+        print(f"DictWithPWL.check: {len(tokens) / check_time:.0f} words per second")
+    misspellings = {
+        "1 error": absent[: args.suggestions],
+        "2 errors": [
+            word[:-2] + "".join(rng.choices(LETTERS, k=2)) for word in absent[: args.suggestions]
+        ],
+        "unrelated": make_words(args.suggestions, random.Random(2)),
+    }
+    for (name, queries) in misspellings.items():
+        suggest_times = sorted(
+            best_time(lambda: pwl.suggest(word), args.repeat) for word in queries
+        )
+        print(
+            f"suggest, {name}: {sum(suggest_times) / len(suggest_times) * 1000:.2f} ms "
+            f"on average, {suggest_times[len(suggest_times) // 2] * 1000:.2f} ms median, "
+            f"{suggest_times[-1] * 1000:.2f} ms at most"
+        )
+
+
+if __name__ == "__main__":
+    main()
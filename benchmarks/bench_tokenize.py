@@ -0,0 +1,42 @@
+"""
+Time the English tokenizer on 1 MiB of mixed-script text, both called
+directly and through the get_tokenizer() chain used by SpellChecker.
+
+Run it against an older checkout with --libs to get a baseline.
+"""
+
+import random
+
+from _common import best_time, make_argument_parser, use_libs
+
+WORDS = (
+    "the quick brown fox don't jump über naïve café résumé Straße "
+    "ελληνικά русский 日本語 été x2 3.14 hello, world! it's"
+).split()
+
+
+def make_text(size=1 << 20):
+    rng = random.Random(1)
+    return " ".join(rng.choice(WORDS) for _ in range(size // 4))[:size]
+
+
+def main():
+    args = make_argument_parser(__doc__).parse_args()
+    use_libs(args.libs)
+    import enchant.tokenize
+    import enchant.tokenize.en
+
+    text = make_text()
+    chain = enchant.tokenize.get_tokenizer("en_US")
+    # Build the unicode character classes outside of the timings
+    list(enchant.tokenize.en.tokenize("warm up"))
+    assert list(chain(text)) == list(enchant.tokenize.en.tokenize(text))
+    direct = best_time(lambda: list(enchant.tokenize.en.tokenize(text)), args.repeat)
+    chained = best_time(lambda: list(chain(text)), args.repeat)
+    print(f"text: {len(text)} characters")
+    print(f"en.tokenize:            {direct:.3f} s")
+    print(f"get_tokenizer('en_US'): {chained:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compile Hunspell dictionaries and compare the verdicts of the compiled
+dictionaries with Hunspell's, as loaded through enchant, on:
+
+- forms: a sample of the word forms written by the compiler
+- edits: a letter inserted into or deleted from each of those forms
+- case: the capitalized and upper case spellings of those forms
+- compounds: pairs of those forms written as one word, which only
+  languages with compound rules accept
+- numbers: numbers, and ordinals which Hunspell builds with compound rules
+- text: the words of the --text files, if any
+
+Pass the .dic files to compare, their .aff files must be next to them.
+This needs the enchant C library with its Hunspell provider.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from _common import make_argument_parser, use_libs
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+EXAMPLES = 5
+
+
+def make_word_lists(forms, sample_size, texts):
+    rng = random.Random(1)
+    sample = rng.sample(forms, min(sample_size, len(forms)))
+    edits = []
+    for word in sample:
+        position = rng.randrange(len(word) + 1)
+        edits.append(word[:position] + rng.choice(LETTERS) + word[position:])
+        if len(word) > 1:
+            position = rng.randrange(len(word))
+            edits.append(word[:position] + word[position + 1 :])
+    word_lists = {
+        "forms": sample,
+        "edits": edits,
+        "case": [w.capitalize() for w in sample] + [w.upper() for w in sample],
+        "compounds": [
+            first + second.lower() for (first, second) in zip(sample, reversed(sample))
+        ],
+        "numbers": [
+            f"{number}{suffix}"
+            for number in range(200)
+            for suffix in ("", "st", "nd", "rd", "th")
+        ],
+    }
+    if texts:
+        import enchant.tokenize
+
+        words = []
+        for filename in texts:
+            with open(filename, "r", encoding="utf-8") as f:
+                words.extend(word for (word, pos) in enchant.tokenize.basic_tokenize(f.read()))
+        word_lists["text"] = words
+    return word_lists
+
+
+def compare(dic_filename, config_directory, sample_size, texts):
+    from enchant.compiled import CompiledDict, compare_verdicts, compile_hunspell_dictionary
+    import enchant
+
+    (tag, _) = os.path.splitext(os.path.basename(dic_filename))
+    aff_filename = os.path.splitext(dic_filename)[0] + ".aff"
+    for filename in (dic_filename, aff_filename):
+        shutil.copy(filename, os.path.join(config_directory, "hunspell"))
+    compiled_filename = os.path.join(config_directory, f"{tag}.scdx")
+    start = time.perf_counter()
+    count = compile_hunspell_dictionary(dic_filename, aff_filename, compiled_filename)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled = CompiledDict(compiled_filename, tag=tag)
+    compiled_load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = enchant.Broker().request_dict(tag)
+    reference_load_time = time.perf_counter() - start
+    print(
+        f"{tag}: {count} forms, {os.path.getsize(compiled_filename) >> 10} KiB, "
+        f"compiled in {compile_time:.1f} s, loaded in {compiled_load_time * 1000:.2f} ms "
+        f"(Hunspell {reference_load_time * 1000:.1f} ms)"
+    )
+    forms = [bytes(word).decode("utf-8") for word in compiled._words]
+    for (name, words) in make_word_lists(forms, sample_size, texts).items():
+        differences = compare_verdicts(compiled, reference, words)
+        false_rejects = [word for (word, verdict, _) in differences if not verdict]
+        false_accepts = [word for (word, verdict, _) in differences if verdict]
+        agreement = 100 * (1 - len(differences) / len(words)) if words else 100
+        print(
+            f"  {name}: {agreement:.2f}% of {len(words)} agree, "
+            f"{len(false_rejects)} wrongly rejected {false_rejects[:EXAMPLES]}, "
+            f"{len(false_accepts)} wrongly accepted {false_accepts[:EXAMPLES]}"
+        )
+    compiled._free()
+
+
+def main():
+    parser = make_argument_parser(__doc__)
+    parser.add_argument("dictionaries", nargs="+", help="the .dic files to compare")
+    parser.add_argument(
+        "--sample", type=int, default=20000, help="compiled forms to check per dictionary"
+    )
+    parser.add_argument(
+        "--text", action="append", default=[], help="a UTF-8 text file whose words to check"
+    )
+    args = parser.parse_args()
+    use_libs(args.libs)
+    with tempfile.TemporaryDirectory() as config_directory:
+        os.mkdir(os.path.join(config_directory, "hunspell"))
+        # Enchant looks for Hunspell dictionaries here, like the add-on sets it up
+        os.environ["ENCHANT_CONFIG_DIR"] = config_directory
+        for dic_filename in args.dictionaries:
+            compare(dic_filename, config_directory, args.sample, args.text)
+
+
+if __name__ == "__main__":
+    main()
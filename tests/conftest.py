@@ -0,0 +1,16 @@
+# The add-on bundles asyncio for NVDA's Python, httpx must use this Python's own
+import asyncio  # noqa: F401
+import os
+import sys
+
+# The add-on bundles its libraries instead of installing them
+LIBS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addon",
+    "globalPlugins",
+    "spellcheck",
+    "libs",
+)
+sys.path.insert(0, LIBS_DIRECTORY)
+# Lets the pure-python parts of enchant be tested without the C library
+os.environ.setdefault("PYENCHANT_IGNORE_MISSING_LIB", "1")
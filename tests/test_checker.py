@@ -0,0 +1,69 @@
+import pytest
+
+from enchant.checker import SpellChecker
+from enchant.pypwl import PyPWL
+
+
+CHECKER_MODES = [
+    {},
+    {"batch_size": 3},
+    {"batch_size": 3, "spans": True},
+]
+
+
+def make_dictionary(*words):
+    dictionary = PyPWL()
+    dictionary.tag = "en"
+    for word in words:
+        dictionary.add(word)
+    return dictionary
+
+
+def collect_errors(text, dictionary, on_error, **kwargs):
+    checker = SpellChecker(dictionary, **kwargs)
+    checker.set_text(text)
+    errors = []
+    for error in checker:
+        errors.append((error.word, error.wordpos))
+        on_error(error)
+    return errors, checker.get_text()
+
+
+@pytest.mark.parametrize("kwargs", CHECKER_MODES)
+def test_words_added_mid_run_are_not_reported_again(kwargs):
+    def add_each_error(error):
+        error.add()
+
+    result = collect_errors(
+        "helo wrld, helo helo wrld", make_dictionary(), add_each_error, **kwargs
+    )
+    assert result == ([("helo", 0), ("wrld", 5)], "helo wrld, helo helo wrld")
+
+
+@pytest.mark.parametrize("kwargs", CHECKER_MODES)
+def test_words_removed_mid_run_are_reported(kwargs):
+    def remove_the(error):
+        error.remove("the")
+
+    result = collect_errors(
+        "helo the cat the end",
+        make_dictionary("the", "cat", "end"),
+        remove_the,
+        **kwargs
+    )
+    assert result == (
+        [("helo", 0), ("the", 5), ("the", 13)],
+        "helo the cat the end",
+    )
+
+
+@pytest.mark.parametrize("kwargs", CHECKER_MODES[1:])
+def test_batch_modes_match_classic_mode_when_adding_words(kwargs):
+    text = "helo wrld, helo helo wrld teh (teh) helo x.y wrld"
+
+    def add_every_other_error(error):
+        if error.wordpos % 2:
+            error.add()
+
+    expected = collect_errors(text, make_dictionary(), add_every_other_error)
+    assert collect_errors(text, make_dictionary(), add_every_other_error, **kwargs) == expected
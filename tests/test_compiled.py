@@ -0,0 +1,138 @@
+import os
+import threading
+
+import pytest
+
+from enchant import compiled
+from enchant.compiled import CompiledDict, compile_hunspell_dictionary
+
+
+AFF = """SET UTF-8
+TRY esiarnto
+SFX S Y 1
+SFX S 0 s .
+PFX U Y 1
+PFX U 0 un .
+"""
+
+DIC = """4
+word/S
+do/U
+known/SU
+iPod/S
+"""
+
+
+def write_hunspell_dictionary(directory):
+    dic = os.path.join(directory, "xx.dic")
+    aff = os.path.join(directory, "xx.aff")
+    with open(dic, "w", encoding="utf-8") as f:
+        f.write(DIC)
+    with open(aff, "w", encoding="utf-8") as f:
+        f.write(AFF)
+    return dic, aff
+
+
+def test_compile_expands_affixes(tmp_path):
+    (dic, aff) = write_hunspell_dictionary(tmp_path)
+    output = os.path.join(tmp_path, "xx.scdx")
+    assert compile_hunspell_dictionary(dic, aff, output) == 12
+    dictionary = CompiledDict(output, tag="xx")
+    try:
+        words = ["word", "words", "undo", "unknowns", "Known", "wordz", "unword"]
+        assert dictionary.check_many(words) == [5, 6]
+    finally:
+        dictionary._free()
+
+
+def test_compiled_dictionary_accepts_what_hunspell_does(tmp_path):
+    (dic, aff) = write_hunspell_dictionary(tmp_path)
+    output = os.path.join(tmp_path, "xx.scdx")
+    compile_hunspell_dictionary(dic, aff, output)
+    dictionary = CompiledDict(output, tag="xx")
+    try:
+        words = ["IPODS", "WORDS", "Ipod", "42", "12,000", "1.5", "1..5", "-1", "1-"]
+        assert dictionary.check_many(words) == [2, 6, 7, 8]
+    finally:
+        dictionary._free()
+
+
+def test_forms_hunspell_only_accepts_in_compounds_are_left_out(tmp_path):
+    dic = os.path.join(tmp_path, "nl.dic")
+    aff = os.path.join(tmp_path, "nl.aff")
+    with open(dic, "w", encoding="utf-8") as f:
+        f.write("3\nordening/L\nbestel/XE\npart/C\n")
+    with open(aff, "w", encoding="utf-8") as f:
+        f.write(
+            "SET UTF-8\nNEEDAFFIX X\nONLYINCOMPOUND C\n"
+            "SFX L Y 1\nSFX L 0 s/C .\nSFX E Y 1\nSFX E 0 en .\n"
+        )
+    output = os.path.join(tmp_path, "nl.scdx")
+    assert compile_hunspell_dictionary(dic, aff, output) == 2
+    dictionary = CompiledDict(output, tag="nl")
+    try:
+        words = ["ordening", "ordenings", "bestel", "bestelen", "part"]
+        assert dictionary.check_many(words) == [1, 2, 4]
+    finally:
+        dictionary._free()
+
+
+def test_turkic_casing(tmp_path):
+    dic = os.path.join(tmp_path, "tr.dic")
+    aff = os.path.join(tmp_path, "tr.aff")
+    with open(dic, "w", encoding="utf-8") as f:
+        f.write("2\nısı\nizmir\n")
+    with open(aff, "w", encoding="utf-8") as f:
+        f.write("SET UTF-8\nLANG tr_TR\n")
+    output = os.path.join(tmp_path, "tr.scdx")
+    compile_hunspell_dictionary(dic, aff, output)
+    dictionary = CompiledDict(output, tag="tr")
+    try:
+        words = ["ISI", "Isı", "İZMİR", "İzmir", "IZMIR", "Izmir", "İSİ"]
+        assert dictionary.check_many(words) == [4, 5, 6]
+    finally:
+        dictionary._free()
+
+
+def test_compile_gives_up_on_too_many_forms(tmp_path):
+    (dic, aff) = write_hunspell_dictionary(tmp_path)
+    output = os.path.join(tmp_path, "xx.scdx")
+    with pytest.raises(ValueError):
+        compile_hunspell_dictionary(dic, aff, output, max_forms=5)
+    assert sorted(os.listdir(tmp_path)) == ["xx.aff", "xx.dic"]
+
+
+def test_compile_merges_sorted_runs(tmp_path, monkeypatch):
+    (dic, aff) = write_hunspell_dictionary(tmp_path)
+    in_memory = os.path.join(tmp_path, "memory.scdx")
+    compile_hunspell_dictionary(dic, aff, in_memory)
+    monkeypatch.setattr(compiled, "_SORT_RUN_SIZE", 3)
+    merged = os.path.join(tmp_path, "merged.scdx")
+    assert compile_hunspell_dictionary(dic, aff, merged) == 12
+    with open(in_memory, "rb") as f, open(merged, "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_concurrent_compiles_of_the_same_output(tmp_path):
+    (dic, aff) = write_hunspell_dictionary(tmp_path)
+    output = os.path.join(tmp_path, "xx.scdx")
+    errors = []
+
+    def compile_dictionary():
+        try:
+            compile_hunspell_dictionary(dic, aff, output)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=compile_dictionary) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(os.listdir(tmp_path)) == ["xx.aff", "xx.dic", "xx.scdx"]
+    dictionary = CompiledDict(output)
+    try:
+        assert dictionary.check("unknowns")
+    finally:
+        dictionary._free()
@@ -0,0 +1,186 @@
+import hashlib
+import http.server
+import importlib
+import os
+import socket
+import sys
+import threading
+import types
+
+import pytest
+
+PLUGIN_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addon",
+    "globalPlugins",
+    "spellcheck",
+)
+CONTENTS = os.urandom(300000)
+
+
+class _Log:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """Serves CONTENTS, honouring ranges, and drops the first few responses midway."""
+
+    daemon_threads = True
+
+    def __init__(self, contents, drops=0):
+        super().__init__(("127.0.0.1", 0), StandInRequestHandler)
+        self.contents = contents
+        self.drops = drops
+        self.ranges = []
+
+    @property
+    def base_url(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+
+class StandInRequestHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        contents = self.server.contents
+        requested_range = self.headers.get("Range")
+        self.server.ranges.append(requested_range)
+        start = 0
+        if requested_range:
+            start = int(requested_range.split("=")[1].split("-")[0])
+        self.send_response(206 if requested_range else 200)
+        self.send_header("Content-Length", str(len(contents) - start))
+        self.end_headers()
+        if self.server.drops:
+            self.server.drops -= 1
+            self.wfile.write(contents[start : start + 50000])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        self.wfile.write(contents[start:])
+
+
+@pytest.fixture
+def language_dictionary(tmp_path, monkeypatch):
+    # Just enough of NVDA for the module to be imported
+    monkeypatch.setitem(
+        sys.modules,
+        "globalVars",
+        types.SimpleNamespace(appArgs=types.SimpleNamespace(configPath=str(tmp_path))),
+    )
+    monkeypatch.setitem(sys.modules, "languageHandler", types.ModuleType("languageHandler"))
+    monkeypatch.setitem(sys.modules, "logHandler", types.SimpleNamespace(log=_Log()))
+    monkeypatch.setitem(
+        sys.modules, "nvwave", types.SimpleNamespace(playWaveFile=lambda filename: None)
+    )
+    # Skip the package's __init__, which needs NVDA's GUI
+    package = types.ModuleType("spellcheck")
+    package.__path__ = [PLUGIN_DIRECTORY]
+    monkeypatch.setitem(sys.modules, "spellcheck", package)
+    for name in ("spellcheck.helpers", "spellcheck.language_dictionary"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module("spellcheck.language_dictionary")
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(contents=CONTENTS, drops=0):
+        server = StandInServer(contents, drops)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def download(language_dictionary, server, destination):
+    """Download CONTENTS from the server, checking it against its git blob SHA-1."""
+    sha = hashlib.sha1(b"blob %d\0" % len(CONTENTS) + CONTENTS).hexdigest()
+    file_info = language_dictionary.DictionaryFileInfo(
+        "xx.dic", f"{server.base_url}/xx/xx.dic", len(CONTENTS), sha
+    )
+    progress = []
+    download_progress = language_dictionary.DownloadProgress(
+        file_info.size, progress.append
+    )
+    source = language_dictionary.HttpMirrorDictionarySource(server.base_url)
+    with language_dictionary.httpx.Client() as client:
+        temp_file_path = language_dictionary._download_file(
+            source, client, file_info, destination, download_progress
+        )
+    return (temp_file_path, progress)
+
+
+def test_dropped_download_is_resumed(language_dictionary, serve, tmp_path):
+    server = serve(drops=2)
+    destination = os.path.join(tmp_path, "xx.dic")
+    (temp_file_path, progress) = download(language_dictionary, server, destination)
+    assert temp_file_path == destination + ".part"
+    with open(temp_file_path, "rb") as f:
+        assert f.read() == CONTENTS
+    assert server.ranges == [None, "bytes=50000-", "bytes=100000-"]
+    assert progress[-1] == 100
+
+
+def test_partial_file_is_resumed(language_dictionary, serve, tmp_path):
+    server = serve()
+    destination = os.path.join(tmp_path, "xx.dic")
+    with open(destination + ".part", "wb") as f:
+        f.write(CONTENTS[:1234])
+    (temp_file_path, progress) = download(language_dictionary, server, destination)
+    with open(temp_file_path, "rb") as f:
+        assert f.read() == CONTENTS
+    assert server.ranges == ["bytes=1234-"]
+
+
+def test_corrupted_download_is_discarded(language_dictionary, serve, tmp_path):
+    server = serve(contents=CONTENTS[:-1] + b"?")
+    destination = os.path.join(tmp_path, "xx.dic")
+    with pytest.raises(language_dictionary.LanguageDictionaryCorrupted):
+        download(language_dictionary, server, destination)
+    assert not os.path.exists(destination + ".part")
+
+
+def test_download_gives_up_after_retries(language_dictionary, serve, tmp_path):
+    server = serve(drops=language_dictionary.DOWNLOAD_RETRIES + 1)
+    destination = os.path.join(tmp_path, "xx.dic")
+    with pytest.raises(language_dictionary.httpx.TransportError):
+        download(language_dictionary, server, destination)
+    # What we have so far is kept for the next attempt
+    assert os.path.getsize(destination + ".part") == 50000 * (
+        language_dictionary.DOWNLOAD_RETRIES + 1
+    )
+
+
+def test_dictionary_loaded_during_download_is_not_kept(language_dictionary, monkeypatch):
+    cache = language_dictionary.LanguageDictionaryCache(4, 1 << 30)
+    loaded = []
+
+    def request_language_dictionary(lang_tag):
+        # The download of newer files finishes while the old ones are loading
+        cache.invalidate(lang_tag)
+        loaded.append(types.SimpleNamespace(tag=lang_tag))
+        return loaded[-1]
+
+    monkeypatch.setattr(
+        language_dictionary, "request_language_dictionary", request_language_dictionary
+    )
+    monkeypatch.setattr(
+        language_dictionary, "get_language_dictionary_files_size", lambda lang_tag: 1
+    )
+    assert cache.get("xx_YY") is loaded[0]
+    assert "xx_YY" not in cache
+    monkeypatch.setattr(
+        language_dictionary,
+        "request_language_dictionary",
+        lambda lang_tag: types.SimpleNamespace(tag=lang_tag),
+    )
+    assert cache.get("xx_YY") is cache.get("xx_YY")
+    assert cache.stats["hits"] == 1
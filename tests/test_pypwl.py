@@ -0,0 +1,38 @@
+import os
+
+from enchant import pypwl
+from enchant.pypwl import PyPWL
+
+
+def read_words(filename):
+    with open(filename) as f:
+        return sorted(ln.strip() for ln in f)
+
+
+def test_removals_reach_the_word_list_when_freed(tmp_path):
+    filename = os.path.join(tmp_path, "xx.dic")
+    with open(filename, "w") as f:
+        f.write("one\ntwo\nthree\n")
+    words = PyPWL(filename)
+    words.remove("two")
+    assert not words.check("two")
+    # Until then the removal only lives in the journal
+    assert read_words(filename) == ["one", "three", "two"]
+    assert PyPWL(filename).check("one") and not PyPWL(filename).check("two")
+    words._free()
+    assert read_words(filename) == ["one", "three"]
+    assert sorted(os.listdir(tmp_path)) == ["xx.dic"]
+
+
+def test_word_list_is_compacted_after_a_few_removals(tmp_path, monkeypatch):
+    monkeypatch.setattr(pypwl, "JOURNAL_COMPACT_THRESHOLD", 3)
+    filename = os.path.join(tmp_path, "xx.dic")
+    open(filename, "w").close()
+    words = PyPWL(filename)
+    words.add_many(["a", "b", "c", "d"])
+    words.remove("a")
+    words.remove("b")
+    assert read_words(filename) == ["a", "b", "c", "d"]
+    words.remove("c")
+    assert read_words(filename) == ["d"]
+    assert sorted(os.listdir(tmp_path)) == ["xx.dic"]
@@ -0,0 +1,70 @@
+import array
+import random
+
+import pytest
+
+from enchant.tokenize import (
+    EmailFilter,
+    HashtagFilter,
+    MentionFilter,
+    URLFilter,
+    WikiWordFilter,
+    get_tokenizer,
+)
+
+PIECES = [
+    "hello", "x.y", "don't", "'tis", "dogs'", "(teh)", '"q"', "http://a.b/c",
+    "me@x.org", "WikiWord", "@bob", "#tag", "naïve", "été", "\U0001d400bc",
+    "12", "...", "a'b'c", "''", "　", "\t", "\n", "日本語", "i.e.",
+]
+FILTER_SETS = [
+    None,
+    [URLFilter],
+    [URLFilter, EmailFilter, WikiWordFilter],
+    [MentionFilter, HashtagFilter],
+]
+
+
+def run_tokenizer(tkn, ops):
+    out = []
+    for (op, offset) in ops:
+        try:
+            if op == "next":
+                (word, pos) = next(tkn)
+                if not isinstance(word, str):
+                    word = word.tounicode()
+                out.append((word, pos, tkn.offset))
+            else:
+                tkn.set_offset(offset, replaced=(op == "replaced"))
+                out.append((op, tkn.offset))
+        except StopIteration:
+            out.append(("stop", tkn.offset))
+    return out
+
+
+@pytest.mark.parametrize("filters", FILTER_SETS)
+def test_whole_text_tokenization_matches_chunk_by_chunk(filters):
+    rng = random.Random(0)
+    for _ in range(300):
+        text = "".join(
+            rng.choice(PIECES) + rng.choice([" ", "", "  ", "\n"])
+            for _ in range(rng.randint(0, 15))
+        )
+        ops = [
+            (rng.choice(["next"] * 6 + ["seek", "replaced"]), rng.randint(0, len(text) + 1))
+            for _ in range(30)
+        ]
+        for source in (text, array.array("u", text)):
+            whole_text = get_tokenizer("en", filters=filters)
+            chunk_by_chunk = get_tokenizer("en", filters=filters)
+            chunk_by_chunk._whole_text = None
+            assert whole_text(source) is not None
+            assert run_tokenizer(whole_text(source), ops) == run_tokenizer(
+                chunk_by_chunk(source), ops
+            )
+
+
+def test_whole_text_tokenization_skips_filtered_chunks():
+    tkn = get_tokenizer("en", filters=[URLFilter, EmailFilter])
+    text = "see http://example.com/page or (mail me@example.org), thanks"
+    assert list(tkn(text)) == [("see", 0), ("or", 28), ("mail", 32), ("thanks", 54)]
@@ -0,0 +1,37 @@
+import threading
+
+from enchant import VerdictCache
+
+
+def test_lru_eviction_and_batches():
+    cache = VerdictCache(maxsize=3)
+    cache.put_many(["a", "b", "c"], [True, False, True])
+    assert cache.get("a") is True
+    cache.put("d", False)
+    assert cache.get_many(["a", "b", "c", "d"]) == [True, None, True, False]
+    info = cache.info()
+    assert (info["hits"], info["misses"], info["size"]) == (4, 1, 3)
+
+
+def test_concurrent_lookups_and_evictions():
+    cache = VerdictCache(maxsize=8)
+    words = [f"w{i}" for i in range(64)]
+    errors = []
+
+    def hammer(offset):
+        try:
+            for i in range(20000):
+                word = words[(i * 7 + offset) % len(words)]
+                if cache.get(word) is None:
+                    cache.put(word, i % 2 == 0)
+                cache.get_many(words[:4])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) <= 8